@@ -1,4 +1,7 @@
 # Import necessary libraries
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
@@ -6,9 +9,17 @@ import seaborn as sns
 import plotly.express as px
 
 
+# Read the CSV through the repository's columnar cache (epi.data) when the
+# package is importable; otherwise parse it with pandas as before
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from epi.data import read_csv
+except ImportError:
+    read_csv = pd.read_csv
+
 # Load the dataset
 data_path = 'Data/disease_dataset.csv'  # Adjust path as needed
-df = pd.read_csv(data_path)
+df = read_csv(data_path)
 
 
 # Examine the data
@@ -1,10 +1,21 @@
 # Step 0: Import necessary libraries
+import os
+import sys
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Read the CSV through the repository's columnar cache (epi.data) when the
+# package is importable; otherwise parse it with pandas as before
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from epi.data import read_csv
+except ImportError:
+    read_csv = pd.read_csv
+
 # Load the dataset
 file_path = 'Depression_and_Population_Data.csv'
-data = pd.read_csv(file_path)
+data = read_csv(file_path)
 
 # Step 1: Data Cleaning
 # ----------------------
@@ -31,25 +42,10 @@ data['Incidence Rate (per 1000)'] = (data['Diagnosed Depression Cases by Region
 # Sort the data by Region and Year for correct sequential calculation
 data = data.sort_values(by=['Region', 'Year']).reset_index(drop=True)
 
-# Create a new column to store the change in incidence rate
-data['Change in Incidence Rate (per 1000)'] = 0.0
-
-# Calculate the year-over-year change in incidence rate by region
-regions = data['Region'].unique()
-
-for region in regions:
-    # Filter data for the specific region
-    regional_data = data[data['Region'] == region]
-    for i in range(1, len(regional_data)):
-        # Get the current and previous row
-        current_row = regional_data.iloc[i]
-        previous_row = regional_data.iloc[i - 1]
-
-        # Calculate the change in incidence rate
-        change_in_incidence = current_row['Incidence Rate (per 1000)'] - previous_row['Incidence Rate (per 1000)']
-
-        # Set the value in the main dataframe
-        data.loc[(data['Region'] == region) & (data['Year'] == current_row['Year']), 'Change in Incidence Rate (per 1000)'] = change_in_incidence
+# Calculate the year-over-year change in incidence rate by region.
+# diff() works on each region's rows in one pass; the first year of each
+# region has no previous year, so its change is set to 0
+data['Change in Incidence Rate (per 1000)'] = data.groupby('Region')['Incidence Rate (per 1000)'].diff().fillna(0.0)
 
 # Step 4: Incidence and Change in Incidence by Year and Region
 # ------------------------------------------------------------
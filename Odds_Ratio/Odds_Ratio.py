@@ -1,23 +1,35 @@
 
+import os
+import sys
+
 import pandas as pd
 import numpy as np
 from scipy.stats import fisher_exact
 
+# Read the CSV through the repository's columnar cache (epi.data) when the
+# package is importable; otherwise parse it with pandas as before
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from epi.data import read_csv
+except ImportError:
+    read_csv = pd.read_csv
+
 # Reading the dataset
-smoking_survey = pd.read_csv("smoking_survey.csv")
+smoking_survey = read_csv("smoking_survey.csv")
 
 # Selecting the required columns
 smoking_survey = smoking_survey[['smoking_status', 'diagnosis_codes']]
 
-# Function to determine if a subject has lung cancer based on diagnosis codes
+# Function to determine if a subject has lung cancer based on diagnosis codes.
+# Each semicolon-joined string is split into separate codes and compared exactly,
+# so a longer code such as C34.901 is not counted as C34.90
 def has_lung_cancer(codes):
-    if "C34.90" in codes or "C96.29" in codes:
-        return "yes"
-    else:
-        return "no"
+    lung_cancer_codes = ["C34.90", "C96.29"]
+    split_codes = codes.str.split(";").explode().str.strip()
+    return np.where(split_codes.isin(lung_cancer_codes).groupby(level=0).any(), "yes", "no")
 
-# Applying the function to the diagnosis_codes column
-smoking_survey['lung_cancer'] = smoking_survey['diagnosis_codes'].apply(has_lung_cancer)
+# Applying the function to the whole diagnosis_codes column at once
+smoking_survey['lung_cancer'] = has_lung_cancer(smoking_survey['diagnosis_codes'])
 
 # Dropping the diagnosis_codes column
 smoking_survey = smoking_survey[['smoking_status', 'lung_cancer']]
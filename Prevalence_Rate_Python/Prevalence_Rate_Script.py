@@ -1,10 +1,21 @@
 # Import necessary libraries
+import os
+import sys
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+# Read the CSV through the repository's columnar cache (epi.data) when the
+# package is importable; otherwise parse it with pandas as before
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from epi.data import read_csv
+except ImportError:
+    read_csv = pd.read_csv
+
 # Load the dataset
 file_path = 'Depression_and_Population_Data.csv'
-data = pd.read_csv(file_path)
+data = read_csv(file_path)
 
 # Step 1: Data Cleaning
 # ----------------------
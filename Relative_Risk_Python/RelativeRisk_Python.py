@@ -1,15 +1,30 @@
+import os
+import sys
+
 import pandas as pd
+import numpy as np
+from statsmodels.stats.contingency_tables import Table2x2
+
+# Read the CSV through the repository's columnar cache (epi.data) when the
+# package is importable; otherwise parse it with pandas as before
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from epi.data import read_csv
+except ImportError:
+    read_csv = pd.read_csv
 
 # Load the data
-data = pd.read_csv('smoking_survey.csv')
+data = read_csv('smoking_survey.csv')
 
 def has_lung_cancer(codes):
-    # Check if the lung cancer codes are present in the diagnosis codes string
+    # Split the diagnosis codes strings into separate codes and check for exact
+    # matches, so a longer code such as C34.901 is not counted as C34.90
     lung_cancer_codes = ['C34.90', 'C96.29']
-    return 'yes' if any(code in codes for code in lung_cancer_codes) else 'no'
+    split_codes = codes.str.split(';').explode().str.strip()
+    return np.where(split_codes.isin(lung_cancer_codes).groupby(level=0).any(), 'yes', 'no')
 
-# Reapply the function considering the grepl-like approach
-data['lung_cancer'] = data['diagnosis_codes'].apply(has_lung_cancer)
+# Apply the function to the whole diagnosis_codes column at once
+data['lung_cancer'] = has_lung_cancer(data['diagnosis_codes'])
 
 # create the filtered data with the adjusted lung cancer identification
 filtered_data = data[['smoking_status', 'lung_cancer']]
@@ -1,9 +1,20 @@
+import os
+import sys
+
 import pandas as pd
 from scipy import stats
 import numpy as np
 
+# Read the CSV through the repository's columnar cache (epi.data) when the
+# package is importable; otherwise parse it with pandas as before
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+try:
+    from epi.data import read_csv
+except ImportError:
+    read_csv = pd.read_csv
+
 # 1. Read CSV file
-df = pd.read_csv("Belfast_Suicide_Counts.csv")
+df = read_csv("Belfast_Suicide_Counts.csv")
 
 
 # 2. Reshape to long format
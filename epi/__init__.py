@@ -0,0 +1,6 @@
+"""Reusable building blocks behind the Broadly Epi tutorial scripts.
+
+The tutorial folders keep their step-by-step scripts; the modules in this
+package hold the vectorized versions of those calculations so they can be
+reused on data sets far larger than the tutorial CSVs.
+"""
@@ -0,0 +1,4 @@
+"""Run the analysis stages: ``python -m epi <stage> [<stage> ...]``."""
+from epi.cli import main
+
+main()
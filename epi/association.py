@@ -0,0 +1,129 @@
+"""Stratified measures of association with bootstrap confidence intervals.
+
+The tutorials report one odds ratio (``fisher_exact``) and one risk ratio
+(``Table2x2``) for the whole file. ``analyze`` computes every stratum's 2x2
+table in one grouped pass, the per-stratum OR and RR, and the
+Mantel-Haenszel pooled OR and RR across strata.
+
+Bootstrap intervals do not resample rows. Each replicate draws multinomial
+cell counts for every stratum from that stratum's observed cell
+probabilities, with the stratum size held fixed. A batch of replicates is a
+single ``Generator.multinomial`` call over a (replicates, strata) grid. With
+``workers`` set, batches run in a process pool with independent seeds.
+
+Every function takes tables of shape (..., 2, 2) laid out as in the
+tutorials: rows exposed / unexposed, columns outcome yes / no.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from epi.contingency import cell_counts
+
+
+def _cells(tables):
+    tables = np.asarray(tables, dtype=float)
+    return tables[..., 0, 0], tables[..., 0, 1], tables[..., 1, 0], tables[..., 1, 1]
+
+
+def odds_ratios(tables):
+    """Odds ratio of each table."""
+    a, b, c, d = _cells(tables)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return a * d / (b * c)
+
+
+def risk_ratios(tables):
+    """Risk ratio (exposed vs unexposed) of each table."""
+    a, b, c, d = _cells(tables)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (a / (a + b)) / (c / (c + d))
+
+
+def mantel_haenszel_or(tables):
+    """Mantel-Haenszel odds ratio pooled over the strata axis (second to last table axis)."""
+    a, b, c, d = _cells(tables)
+    n = a + b + c + d
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nansum(a * d / n, axis=-1) / np.nansum(b * c / n, axis=-1)
+
+
+def mantel_haenszel_rr(tables):
+    """Mantel-Haenszel risk ratio pooled over the strata axis."""
+    a, b, c, d = _cells(tables)
+    n = a + b + c + d
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.nansum(a * (c + d) / n, axis=-1) / np.nansum(c * (a + b) / n, axis=-1)
+
+
+def _resample_batch(tables, size, seed):
+    # Statistics for `size` bootstrap replicates: per-stratum OR and RR of
+    # shape (size, strata) and pooled MH OR and RR of shape (size,)
+    rng = np.random.default_rng(seed)
+    totals = tables.sum(axis=(1, 2))
+    probabilities = tables.reshape(len(tables), 4) / np.maximum(totals, 1)[:, None]
+    draws = rng.multinomial(totals, probabilities, size=(size, len(tables))).reshape(size, len(tables), 2, 2)
+    return odds_ratios(draws), risk_ratios(draws), mantel_haenszel_or(draws), mantel_haenszel_rr(draws)
+
+
+def bootstrap(tables, n_resamples=10_000, seed=None, workers=None, batch_size=1_000):
+    """Bootstrap statistics for (strata, 2, 2) `tables`.
+
+    Returns a dict of arrays: ``or`` and ``rr`` with shape
+    (n_resamples, strata), ``or_mh`` and ``rr_mh`` with shape (n_resamples,).
+    """
+    tables = np.asarray(tables, dtype=np.int64).reshape(-1, 2, 2)
+    sizes = [batch_size] * (n_resamples // batch_size)
+    if n_resamples % batch_size:
+        sizes.append(n_resamples % batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            batches = list(pool.map(_resample_batch, [tables] * len(sizes), sizes, seeds))
+    else:
+        batches = [_resample_batch(tables, size, child) for size, child in zip(sizes, seeds)]
+
+    return {
+        name: np.concatenate([batch[i] for batch in batches])
+        for i, name in enumerate(('or', 'rr', 'or_mh', 'rr_mh'))
+    }
+
+
+def percentile_interval(samples, alpha=0.05):
+    """Percentile bootstrap interval along the first axis, ignoring undefined replicates."""
+    with np.errstate(invalid='ignore'):
+        samples = np.where(np.isfinite(samples), samples, np.nan)
+        return np.nanpercentile(samples, [100 * alpha / 2, 100 * (1 - alpha / 2)], axis=0)
+
+
+def analyze(exposed, has_outcome, strata=None, n_resamples=10_000, alpha=0.05, seed=None, workers=None):
+    """Per-stratum and Mantel-Haenszel OR and RR with bootstrap intervals.
+
+    `exposed` and `has_outcome` are boolean arrays (or Series) and `strata`
+    an optional array of stratum labels such as age bands or zipcodes.
+    Returns one row per stratum plus a final ``'Mantel-Haenszel'`` row.
+    Set ``n_resamples=0`` to skip the bootstrap.
+    """
+    labels, tables = cell_counts(exposed, has_outcome, strata)
+    if strata is None:
+        labels = ['All']
+
+    frame = pd.DataFrame({
+        'stratum': list(labels) + ['Mantel-Haenszel'],
+        'a': np.append(tables[:, 0, 0], tables[:, 0, 0].sum()),
+        'b': np.append(tables[:, 0, 1], tables[:, 0, 1].sum()),
+        'c': np.append(tables[:, 1, 0], tables[:, 1, 0].sum()),
+        'd': np.append(tables[:, 1, 1], tables[:, 1, 1].sum()),
+        'OR': np.append(odds_ratios(tables), mantel_haenszel_or(tables)),
+        'RR': np.append(risk_ratios(tables), mantel_haenszel_rr(tables)),
+    })
+    if n_resamples:
+        samples = bootstrap(tables, n_resamples=n_resamples, seed=seed, workers=workers)
+        for measure, stratum_key, pooled_key in (('OR', 'or', 'or_mh'), ('RR', 'rr', 'rr_mh')):
+            lower, upper = percentile_interval(samples[stratum_key], alpha)
+            pooled_lower, pooled_upper = percentile_interval(samples[pooled_key], alpha)
+            frame[f'{measure} lower'] = np.append(lower, pooled_lower)
+            frame[f'{measure} upper'] = np.append(upper, pooled_upper)
+    return frame
@@ -0,0 +1 @@
+"""Benchmark scripts, run as ``python -m epi.benchmarks.<name>``."""
@@ -0,0 +1,73 @@
+"""Compare the batched SIR/SEIR solver with looping odeint over the tutorial models.
+
+Usage: python -m epi.benchmarks.compartmental [--model seir] [--sizes 100 10000 ...]
+
+The odeint loop is only timed up to ``--loop-max`` scenarios.
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.integrate import odeint
+
+from epi.compartmental import seir_model, seir_rhs, sir_model, sir_rhs, solve_batch
+
+
+def random_scenarios(model, size, N=1000, seed=0):
+    """Random parameter sets and initial states around the tutorial values."""
+    rng = np.random.default_rng(seed)
+    params = {
+        'N': np.full(size, float(N)),
+        'beta': rng.uniform(0.2, 0.6, size),
+        'gamma': rng.uniform(0.05, 0.2, size),
+    }
+    infected = rng.integers(1, 10, size).astype(float)
+    if model == 'seir':
+        params['sigma'] = rng.uniform(1 / 7, 1 / 3, size)
+        y0 = np.column_stack([N - infected, np.zeros(size), infected, np.zeros(size)])
+    else:
+        y0 = np.column_stack([N - infected, infected, np.zeros(size)])
+    return y0, params
+
+
+def loop_odeint(model, y0, times, params):
+    func = seir_model if model == 'seir' else sir_model
+    names = ('N', 'beta', 'gamma', 'sigma') if model == 'seir' else ('N', 'beta', 'gamma')
+    return np.stack([
+        odeint(func, y0[i], times, args=tuple(params[name][i] for name in names))
+        for i in range(len(y0))
+    ])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', choices=['sir', 'seir'], default='seir')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**2, 10**3, 10**4, 10**5])
+    parser.add_argument('--days', type=int, default=50)
+    parser.add_argument('--loop-max', type=int, default=10**3)
+    args = parser.parse_args(argv)
+
+    times = np.arange(0, args.days + 1, 1)
+    rhs = seir_rhs if args.model == 'seir' else sir_rhs
+    names = ('N', 'beta', 'gamma', 'sigma') if args.model == 'seir' else ('N', 'beta', 'gamma')
+
+    print(f"{'scenarios':>10} {'batched (s)':>12} {'odeint loop (s)':>16} {'speedup':>8} {'max rel err':>12}")
+    for size in args.sizes:
+        y0, params = random_scenarios(args.model, size)
+        start = time.perf_counter()
+        batched = solve_batch(rhs, y0, times, [params[name] for name in names])
+        batched_seconds = time.perf_counter() - start
+
+        loop_seconds = error = float('nan')
+        if size <= args.loop_max:
+            start = time.perf_counter()
+            looped = loop_odeint(args.model, y0, times, params)
+            loop_seconds = time.perf_counter() - start
+            error = np.max(np.abs(batched - looped)) / params['N'][0]
+
+        print(f"{size:>10} {batched_seconds:>12.4f} {loop_seconds:>16.4f} "
+              f"{loop_seconds / batched_seconds:>8.1f} {error:>12.2e}")
+
+
+if __name__ == '__main__':
+    main()
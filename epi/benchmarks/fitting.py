@@ -0,0 +1,75 @@
+"""Fit synthetic incidence of known parameters and report wall time and solves.
+
+Usage: python -m epi.benchmarks.fitting [--model seir] [--days 100]
+
+The baseline is a derivative-free Nelder-Mead search over plain odeint
+solves of the tutorial model, which is how the scripts would be driven by
+hand.
+"""
+import argparse
+import time
+
+import numpy as np
+from scipy.integrate import odeint
+from scipy.optimize import minimize
+
+from epi.compartmental import seir_model, sir_model
+from epi.fitting import fit
+
+TRUTH = {
+    'sir': ([999, 1, 0], {'beta': 0.3, 'gamma': 0.1}),
+    'seir': ([999, 0, 1, 0], {'beta': 0.5, 'gamma': 0.1, 'sigma': 1 / 5}),
+}
+N = 1000
+
+
+def synthetic_incidence(model, days, noise, seed=0):
+    y0, truth = TRUTH[model]
+    times = np.arange(0, days + 1, 1.0)
+    func = seir_model if model == 'seir' else sir_model
+    y = odeint(func, y0, times, args=(N, *truth.values()))
+    incidence = y[:-1, 0] - y[1:, 0]
+    if noise:
+        incidence = np.random.default_rng(seed).poisson(incidence).astype(float)
+    return times, incidence
+
+
+def nelder_mead(model, observed, times, start):
+    y0 = TRUTH[model][0]
+    func = seir_model if model == 'seir' else sir_model
+    solves = [0]
+
+    def cost(log_values):
+        solves[0] += 1
+        y = odeint(func, y0, times, args=(N, *np.exp(log_values)))
+        return np.sum((y[:-1, 0] - y[1:, 0] - observed) ** 2)
+
+    started = time.perf_counter()
+    result = minimize(cost, np.log(start), method='Nelder-Mead', options={'xatol': 1e-8, 'fatol': 1e-8, 'maxfev': 20000})
+    return np.exp(result.x), solves[0], time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', choices=sorted(TRUTH), default='seir')
+    parser.add_argument('--days', type=int, default=100)
+    parser.add_argument('--noise', action='store_true', help='add Poisson noise to the synthetic series')
+    args = parser.parse_args(argv)
+
+    y0, truth = TRUTH[args.model]
+    times, observed = synthetic_incidence(args.model, args.days, args.noise)
+
+    result = fit(args.model, observed, times, y0, N, loss='poisson' if args.noise else 'gaussian')
+    print(f"truth:        {truth}")
+    print(f"fit:          { {name: round(float(value), 4) for name, value in result['params'].items()} }")
+    print(f"  {result['seconds']:.3f} s, {result['solves']} sensitivity solves, "
+          f"{result['cache_hits']} cache hits, {result['batch_candidates']} batched start candidates")
+
+    start = [0.2] * len(truth)
+    values, solves, seconds = nelder_mead(args.model, observed, times, start)
+    print(f"Nelder-Mead:  { {name: round(float(value), 4) for name, value in zip(truth, values)} }")
+    print(f"  {seconds:.3f} s, {solves} odeint solves")
+
+
+if __name__ == '__main__':
+    main()
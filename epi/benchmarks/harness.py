@@ -0,0 +1,104 @@
+"""Time, memory and call-count profile of every analysis stage at several scales.
+
+Usage: python -m epi.benchmarks.harness [--stages prevalence ttest ...] [--scales 1 10 100]
+                                        [--repeat 3] [--output results.json]
+
+Stages are ``epi.stages.STAGES`` plus the tutorial baselines in
+``BASELINE_STAGES`` (the incidence loop, the ``.apply`` odds ratio and the
+per-disease correlation). Each stage runs on synthetic input from
+``epi.stages.synthetic_input`` (generated outside the timed region). For
+every stage and scale the harness makes one untimed warm-up call (stages
+import lazily), then records the best wall time over ``--repeat`` plain
+runs, the tracemalloc peak of one traced run and the call counts and
+hottest functions of one cProfile run, and writes everything to a JSON file.
+"""
+import argparse
+import cProfile
+import json
+import platform
+import pstats
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from epi.stages import BASELINE_STAGES, STAGES, synthetic_input
+
+ALL_STAGES = {**STAGES, **BASELINE_STAGES}
+
+
+def profile_stage(stage, data, repeat=3, top=10):
+    """Timing, peak traced memory and cProfile summary of one stage on `data`."""
+    _, function = ALL_STAGES[stage]
+    # Untimed first call, so lazy imports inside the stage are not counted
+    function(data)
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(data)
+        seconds.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    profiler = cProfile.Profile()
+    profiler.runcall(function, data)
+    stats = pstats.Stats(profiler)
+    hottest = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:top]
+    return {
+        'seconds': min(seconds),
+        'seconds_all': seconds,
+        'peak_bytes': peak,
+        'calls': stats.total_calls,
+        'primitive_calls': stats.prim_calls,
+        'hottest': [
+            {
+                'function': f'{filename}:{line}({name})',
+                'calls': calls,
+                'tottime': tottime,
+                'cumtime': cumtime,
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in hottest
+        ],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stages', nargs='+', choices=list(ALL_STAGES), default=list(ALL_STAGES))
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10, help='hottest functions (by own time) to keep')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    args = parser.parse_args(argv)
+
+    results = []
+    print(f"{'stage':>18} {'scale':>7} {'seconds':>9} {'peak MB':>8} {'calls':>9}")
+    for stage in args.stages:
+        input_name, _ = ALL_STAGES[stage]
+        for scale in args.scales:
+            data = synthetic_input(input_name, scale, seed=args.seed)
+            result = profile_stage(stage, data, repeat=args.repeat, top=args.top)
+            results.append({'stage': stage, 'input': input_name, 'scale': scale, **result})
+            print(f"{stage:>18} {scale:>7g} {result['seconds']:>9.4f} "
+                  f"{result['peak_bytes'] / 1e6:>8.1f} {result['calls']:>9}")
+
+    with open(args.output, 'w') as handle:
+        json.dump({
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'platform': platform.platform(),
+            'seed': args.seed,
+            'repeat': args.repeat,
+            'results': results,
+        }, handle, indent=2)
+    print(f"wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Compare the vectorized incidence change with the tutorial's row loop.
+
+Usage: python -m epi.benchmarks.incidence [--sizes 1000 10000 ...]
+
+The row loop is quadratic, so it is only timed up to ``--loop-max-rows``.
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from epi.incidence import CASES, CHANGE, POPULATION, RATE, add_incidence_columns, incidence_rate
+
+
+def synthetic_frame(n_rows, n_years=20, n_strata=1, seed=0):
+    """Region x Year (x Stratum) frame with the same columns as the tutorial CSV."""
+    rng = np.random.default_rng(seed)
+    n_groups = max(1, n_rows // n_years)
+    n_regions = max(1, n_groups // n_strata)
+    rows = np.arange(n_rows)
+    frame = pd.DataFrame({
+        'Region': 'Region ' + pd.Series(rows // n_years % n_regions).astype(str),
+        'Stratum': rows // (n_years * n_regions) % n_strata,
+        'Year': 2000 + rows % n_years,
+        POPULATION: rng.integers(10_000, 2_000_000, n_rows).astype(float),
+    })
+    frame[CASES] = np.floor(frame[POPULATION] * rng.uniform(0.005, 0.03, n_rows))
+    # Shuffle so neither implementation gets pre-sorted input for free
+    return frame.sample(frac=1.0, random_state=seed).reset_index(drop=True)
+
+
+def loop_change(data):
+    """Step 3 of Incidence_Rate_Python.py, kept verbatim as the baseline."""
+    data = data.sort_values(by=['Region', 'Year']).reset_index(drop=True)
+    data[CHANGE] = 0.0
+    for region in data['Region'].unique():
+        regional_data = data[data['Region'] == region]
+        for i in range(1, len(regional_data)):
+            current_row = regional_data.iloc[i]
+            previous_row = regional_data.iloc[i - 1]
+            change_in_incidence = current_row[RATE] - previous_row[RATE]
+            data.loc[(data['Region'] == region) & (data['Year'] == current_row['Year']), CHANGE] = change_in_incidence
+    return data
+
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**3, 10**4, 10**5, 10**6, 10**7])
+    parser.add_argument('--loop-max-rows', type=int, default=10**4)
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'vectorized (s)':>15} {'loop (s)':>10} {'speedup':>8}")
+    for n_rows in args.sizes:
+        frame = synthetic_frame(n_rows)
+        fast_seconds, fast = _timed(add_incidence_columns, frame.copy())
+
+        loop_seconds = float('nan')
+        if n_rows <= args.loop_max_rows:
+            baseline = frame.copy()
+            baseline[RATE] = incidence_rate(baseline[CASES], baseline[POPULATION])
+            loop_seconds, slow = _timed(loop_change, baseline)
+            # Both paths must agree before the timing means anything
+            fast_sorted = fast.sort_values(['Region', 'Year']).reset_index(drop=True)
+            np.testing.assert_allclose(fast_sorted[CHANGE].to_numpy(), slow[CHANGE].to_numpy())
+
+        print(f"{n_rows:>10} {fast_seconds:>15.4f} {loop_seconds:>10.4f} {loop_seconds / fast_seconds:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
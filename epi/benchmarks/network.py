@@ -0,0 +1,53 @@
+"""Time per step and peak memory of the network SIR/SEIR simulator by population size.
+
+Usage: python -m epi.benchmarks.network [--sizes 10000 1000000 ...] [--model sir]
+
+Peak memory is the tracemalloc peak during the simulation (numpy arrays
+are traced), reported next to the size of the CSR graph itself. Time per
+step divides by the days actually simulated, which is fewer than
+``--days`` when the epidemic dies out early.
+"""
+import argparse
+import time
+import tracemalloc
+
+from epi.network import random_graph, simulate, steps_run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', choices=['sir', 'seir'], default='seir')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10**4, 10**5, 10**6])
+    parser.add_argument('--mean-degree', type=float, default=10)
+    parser.add_argument('--days', type=int, default=100)
+    parser.add_argument('--beta', type=float, default=0.05)
+    parser.add_argument('--gamma', type=float, default=0.1)
+    parser.add_argument('--sigma', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    sigma = args.sigma if args.model == 'seir' else None
+    print(f"{'agents':>10} {'edges':>11} {'graph (s)':>10} {'graph MB':>9} "
+          f"{'steps':>6} {'ms/step':>8} {'peak MB':>8} {'attack rate':>12}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        indptr, indices = random_graph(size, args.mean_degree, seed=args.seed)
+        graph_seconds = time.perf_counter() - start
+        graph_mb = (indptr.nbytes + indices.nbytes) / 1e6
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        counts = simulate(indptr, indices, args.days, args.beta, args.gamma, sigma,
+                          initial_infected=max(10, size // 10_000), seed=args.seed)
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        steps = steps_run(counts)
+        print(f"{size:>10} {len(indices) // 2:>11} {graph_seconds:>10.2f} {graph_mb:>9.1f} "
+              f"{steps:>6} {1000 * seconds / steps:>8.2f} {peak / 1e6:>8.1f} "
+              f"{1 - counts[-1, 0] / size:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+"""Compare odeint with the solve_ivp backends on a long daily horizon.
+
+Usage: python -m epi.benchmarks.solvers [--model seir] [--years 10]
+"""
+import argparse
+
+import numpy as np
+
+from epi.solvers import odeint_baseline, solve
+
+TUTORIAL = {
+    'sir': ([999, 1, 0], {'N': 1000, 'beta': 0.3, 'gamma': 0.1}),
+    'seir': ([999, 0, 1, 0], {'N': 1000, 'beta': 0.5, 'gamma': 0.1, 'sigma': 1 / 5}),
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', choices=sorted(TUTORIAL), default='seir')
+    parser.add_argument('--years', type=int, default=10)
+    args = parser.parse_args(argv)
+
+    y0, params = TUTORIAL[args.model]
+    times = np.arange(0, 365 * args.years + 1, 1)
+
+    baseline = odeint_baseline(args.model, y0, times, **params)
+    print(f"{'backend':<28} {'outputs':>8} {'nfev':>6} {'njev':>6} {'ms':>8} {'peak':>7} {'reff<1':>7} {'end':>7}")
+    print(f"{'odeint (full horizon)':<28} {len(baseline['times']):>8} {baseline['nfev']:>6} "
+          f"{baseline['njev']:>6} {baseline['seconds'] * 1000:>8.1f}")
+
+    runs = [
+        ('LSODA, finite differences', 'LSODA', False, False),
+        ('LSODA, analytic jac', 'LSODA', True, False),
+        ('BDF, analytic jac', 'BDF', True, False),
+        ('RK45', 'RK45', False, False),
+        ('LSODA, analytic jac, stop', 'LSODA', True, True),
+        ('BDF, analytic jac, stop', 'BDF', True, True),
+    ]
+    for label, method, use_jacobian, stop_at_end in runs:
+        result = solve(args.model, y0, times, method=method, use_jacobian=use_jacobian,
+                       stop_at_end=stop_at_end, **params)
+        events = [result['events'][name] for name in ('peak', 'reff_below_1', 'end')]
+        events = ' '.join(f"{'-' if value is None else f'{value:.1f}':>7}" for value in events)
+        print(f"{label:<28} {len(result['times']):>8} {result['nfev']:>6} {result['njev']:>6} "
+              f"{result['seconds'] * 1000:>8.1f} {events}")
+
+
+if __name__ == '__main__':
+    main()
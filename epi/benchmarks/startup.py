@@ -0,0 +1,109 @@
+"""Startup time of ``python -m epi`` stages against eager imports of the tutorial libraries.
+
+Usage: python -m epi.benchmarks.startup [--stages sir correlation ...] [--repeat 5]
+
+Each command runs in a fresh interpreter. ``eager imports`` runs every
+import statement found in the tutorial scripts, exactly as written (so
+``from scipy.stats import fisher_exact``, not just ``import scipy``),
+skipping those whose package is not installed. That is what each tutorial
+run used to pay before doing any work. The heavy column lists which of the
+tutorial libraries a command actually imported, taken from
+``python -X importtime``.
+"""
+import argparse
+import ast
+import glob
+import importlib.util
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from epi.data import ROOT
+
+TUTORIAL_IMPORTS = ('pandas', 'numpy', 'scipy', 'matplotlib', 'seaborn', 'plotly', 'statsmodels',
+                    'geopandas', 'folium')
+
+
+def tutorial_import_statements():
+    """Import statements of the tutorial scripts whose packages are installed, and the missing packages."""
+    statements, missing = [], set()
+    scripts = sorted(glob.glob(os.path.join(ROOT, '*', '*.py')))
+    for script in scripts:
+        if os.path.basename(os.path.dirname(script)) in ('epi', 'tests'):
+            continue
+        with open(script, encoding='utf-8-sig') as handle:
+            tree = ast.parse(handle.read())
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                packages = [alias.name.split('.')[0] for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                packages = [node.module.split('.')[0]]
+            else:
+                continue
+            absent = [name for name in packages if importlib.util.find_spec(name) is None]
+            missing.update(absent)
+            statement = ast.unparse(node)
+            if not absent and statement not in statements:
+                statements.append(statement)
+    return statements, sorted(missing)
+
+
+def _environment():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    return env
+
+
+def time_command(command, repeat):
+    """Median wall time of `command` over `repeat` runs, discarding its output."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=_environment())
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def heavy_imports(command):
+    """Tutorial libraries imported by `command`, from ``-X importtime`` output."""
+    result = subprocess.run([command[0], '-X', 'importtime', *command[1:]], check=True, capture_output=True,
+                            text=True, env=_environment())
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines() if '|' in line}
+    return [name for name in TUTORIAL_IMPORTS if name in imported]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--stages', nargs='+',
+                        default=['sir', 'seir', 'correlation', 'odds-ratio', 'prevalence', 'ttest'])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    statements, missing = tutorial_import_statements()
+    commands = {
+        'python (empty)': [sys.executable, '-c', 'pass'],
+        'eager imports': [sys.executable, '-c', '\n'.join(statements)],
+        'epi --help': [sys.executable, '-m', 'epi', '--help'],
+    }
+    for stage in args.stages:
+        commands[f'epi {stage}'] = [sys.executable, '-m', 'epi', stage]
+    commands[f"epi {' '.join(args.stages)}"] = [sys.executable, '-m', 'epi', *args.stages]
+
+    # Build the data cache first so cold CSV parsing is not counted
+    subprocess.run(commands[f"epi {' '.join(args.stages)}"], check=True, stdout=subprocess.DEVNULL,
+                   env=_environment())
+
+    width = max(len(name) for name in commands)
+    print(f"{'command':<{width}} {'median (s)':>10}  heavy imports")
+    for name, command in commands.items():
+        seconds = time_command(command, args.repeat)
+        heavy = ', '.join(heavy_imports(command)) or '-'
+        print(f'{name:<{width}} {seconds:>10.3f}  {heavy}')
+    if missing:
+        print(f"eager imports skip tutorial packages that are not installed: {', '.join(missing)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""Vectorized colour classes, tooltips and legends for the Leaflet map layers.
+
+The tutorial builds tooltips with ``.apply(lambda row: ..., axis=1)``,
+colours counties through the ``get_color`` if/elif ladder once per feature
+and writes the legend by hand, so the legend can drift from the colours.
+Here one ``ColorBins`` spec drives all three: ``classify`` bins a whole
+column with ``np.searchsorted`` (the ``np.digitize`` rule), ``add_colors``
+stores fill colour and opacity as columns, and ``legend_html`` renders the
+legend from the same edges, colours and labels.
+"""
+import html
+
+import numpy as np
+import pandas as pd
+
+
+class ColorBins:
+    """Upper-inclusive bin edges with one colour per class.
+
+    Values up to ``edges[0]`` fall in class 0, values in
+    ``(edges[i - 1], edges[i]]`` in class i, and values above the last edge
+    in the final class, so there is one more colour than there are edges.
+    Class 0 is drawn with `empty_opacity`, every other class with `opacity`.
+    """
+
+    def __init__(self, edges, colors, labels=None, opacity=0.7, empty_opacity=0.0):
+        if len(colors) != len(edges) + 1:
+            raise ValueError(f"need {len(edges) + 1} colors for {len(edges)} edges, got {len(colors)}")
+        self.edges = np.asarray(edges, dtype=float)
+        self.colors = np.asarray(colors)
+        self.labels = list(labels) if labels is not None else self.default_labels()
+        self.opacity = opacity
+        self.empty_opacity = empty_opacity
+
+    def default_labels(self):
+        """Labels for integer counts: '0', '1', '3 - 4', ..., '13+'."""
+        edges = [int(edge) for edge in self.edges]
+        labels = [f'{edges[0]}']
+        for low, high in zip(edges[:-1], edges[1:]):
+            labels.append(f'{high}' if high == low + 1 else f'{low + 1} - {high}')
+        labels.append(f'{edges[-1] + 1}+')
+        return labels
+
+    def classify(self, values):
+        """Class index of every value."""
+        return np.searchsorted(self.edges, np.asarray(values, dtype=float), side='left')
+
+    def fill(self, values):
+        """Fill colour and fill opacity arrays for `values`."""
+        classes = self.classify(values)
+        return self.colors[classes], np.where(classes > 0, self.opacity, self.empty_opacity)
+
+    def legend_html(self, title, position='bottom: 50px; left: 50px;'):
+        """Fixed-position legend listing every class, matching ``fill``."""
+        items = []
+        for i, (color, label) in enumerate(zip(self.colors, self.labels)):
+            border = ' border: 1px solid black;' if i == 0 else ''
+            items.append(f'    <i style="background: {color};{border} padding: 5px;">&nbsp;&nbsp;</i> {label}')
+        return (
+            f'<div style="position: fixed; {position} width: 300px;\n'
+            f'            background-color: white; z-index:1000; font-size:14px;\n'
+            f'            border:2px solid grey; padding: 10px;">\n'
+            f'    <b>{title}</b><br>\n'
+            + '<br>\n'.join(items)
+            + '\n</div>\n'
+        )
+
+
+# The tutorial's get_color ladder and legend
+TRAUMA_BINS = ColorBins(
+    edges=(0, 1, 2, 4, 6, 12),
+    colors=('#ffffff00', '#ffffb2', '#fecc5c', '#fd8d3c', '#f03b20', '#bd0026', '#800026'),
+    labels=('No Facilities', '1 Facility', '2 Facilities', '3 - 4 Facilities', '5 - 6 Facilities',
+            '7 - 12 Facilities', '13+ Facilities'),
+)
+
+
+def add_colors(frame, value_column, bins=TRAUMA_BINS):
+    """Add ``fill_color`` and ``fill_opacity`` columns classified from `value_column`."""
+    frame = frame.copy()
+    frame['fill_color'], frame['fill_opacity'] = bins.fill(frame[value_column])
+    return frame
+
+
+def style_from_properties(feature):
+    """Folium ``style_function`` that only reads the precomputed columns."""
+    properties = feature['properties']
+    return {
+        'fillColor': properties['fill_color'],
+        'color': 'black',
+        'weight': 1,
+        'fillOpacity': properties['fill_opacity'],
+    }
+
+
+def tooltip_html(frame, fields, missing='N/A', escape=True):
+    """One HTML tooltip per row, built with column-wise string operations.
+
+    `fields` maps a label to a column name, or to a list of column names
+    joined with ', ' (e.g. ``{'City, State': ['CITY', 'STATE']}``). Columns
+    that are absent or empty show `missing`.
+    """
+    def text(column):
+        if column not in frame:
+            return pd.Series(missing, index=frame.index, dtype=object)
+        values = frame[column].astype(object).where(frame[column].notna(), missing).astype(str)
+        if escape:
+            values = values.str.replace('&', '&amp;').str.replace('<', '&lt;').str.replace('>', '&gt;')
+        return values
+
+    lines = []
+    for label, columns in fields.items():
+        if isinstance(columns, str):
+            columns = [columns]
+        value = text(columns[0])
+        for column in columns[1:]:
+            value = value + ', ' + text(column)
+        lines.append(f'<b>{html.escape(label)}:</b> ' + value)
+
+    tooltip = lines[0]
+    for line in lines[1:]:
+        tooltip = tooltip + '<br>' + line
+    return tooltip
+
+
+# Tooltip layout of the tutorial's hospital point layer
+HOSPITAL_TOOLTIP = {
+    'Name': 'NAME',
+    'Address': 'ADDRESS',
+    'City, State': ['CITY', 'STATE'],
+    'Type': 'NAICS_DESC',
+    'Beds': 'BEDS',
+}
+
+
+def join_names(names, groups, separator='<br>'):
+    """`names` joined per group, as a Series indexed by group."""
+    names = pd.Series(np.asarray(names, dtype=object)).astype(str)
+    return names.groupby(np.asarray(groups), sort=False).agg(separator.join)
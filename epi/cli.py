@@ -0,0 +1,129 @@
+"""Command-line entry point: ``python -m epi <stage> [<stage> ...]``.
+
+Runs one or more analysis stages from ``epi.stages`` in a single process
+and prints their results. Only the modules a stage needs are imported, and
+only when it runs: ``sir`` never loads pandas, the CSV stages never load
+geopandas, and nothing loads matplotlib, seaborn, plotly or folium. Stages
+that read the same input share it, so ``python -m epi prevalence
+incidence`` parses the depression data once (through the columnar cache of
+``epi.data``).
+
+Every stage reads a CSV or parameters that ship with the repository except
+``map``, which needs the county shapefile
+(``LeafletMapPython/Data/CountyShapefiles/cb_2018_us_county_500k.shp``
+with its sidecars) and ``LeafletMapPython/Data/Hospitals.geojson``; neither
+is in the repository. Naming a stage whose input cannot be loaded is an
+error. ``all`` instead skips such stages, runs the rest and lists what it
+skipped on stderr. With ``--synthetic`` every stage has its input.
+
+Examples::
+
+    python -m epi odds-ratio relative-risk
+    python -m epi all --timing
+    python -m epi ttest correlation --synthetic 100
+    python -m epi map --map-dir hospital_density_map
+"""
+import argparse
+import sys
+import time
+
+from epi.stages import STAGES, load_input, synthetic_input
+
+# Compartment labels of the ODE stages
+COMPARTMENTS = {
+    'sir': ('S', 'I', 'R'),
+    'seir': ('S', 'E', 'I', 'R'),
+}
+
+
+def _format_trajectories(stage, trajectories, max_scenarios=20):
+    labels = COMPARTMENTS[stage]
+    infectious = labels.index('I')
+    if len(trajectories) == 1:
+        lines = [f"{'day':>4} " + ' '.join(f'{label:>9}' for label in labels)]
+        for day, row in enumerate(trajectories[0]):
+            lines.append(f'{day:>4} ' + ' '.join(f'{value:>9.1f}' for value in row))
+        return '\n'.join(lines)
+
+    lines = [f"{'scenario':>8} {'peak I':>9} {'peak day':>8} {'final R':>9}"]
+    for i, trajectory in enumerate(trajectories[:max_scenarios]):
+        peak_day = int(trajectory[:, infectious].argmax())
+        lines.append(f'{i:>8} {trajectory[peak_day, infectious]:>9.1f} {peak_day:>8} {trajectory[-1, -1]:>9.1f}')
+    if len(trajectories) > max_scenarios:
+        lines.append(f'... {len(trajectories) - max_scenarios} more scenarios')
+    return '\n'.join(lines)
+
+
+def format_result(stage, result):
+    """Plain-text rendering of a stage result."""
+    if stage in COMPARTMENTS:
+        return _format_trajectories(stage, result)
+    if stage == 'prevalence':
+        return '\n\n'.join(f"By {', '.join(keys)}:\n{frame.to_string(index=False)}" for keys, frame in result.items())
+    if stage in ('odds-ratio', 'relative-risk'):
+        from epi.contingency import as_crosstab
+
+        lines = [as_crosstab(result['table']).to_string(), '']
+        if stage == 'odds-ratio':
+            lines.append(f"Odds Ratio: {result['odds_ratio']:.4f}, p-value: {result['p']:.4g}")
+        else:
+            lines.append(f"Relative Risk: {result['relative_risk']:.4f}, "
+                         f"95% CI: ({result['lower']:.4f}, {result['upper']:.4f})")
+        return '\n'.join(lines)
+    if stage == 'map':
+        return '\n'.join(f'{path}: {size:,} bytes' for path, size in result.items())
+    return result.to_string(index=stage != 'incidence')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m epi', description=__doc__.splitlines()[0])
+    parser.add_argument('stages', nargs='+', choices=[*STAGES, 'all'], metavar='stage',
+                        help=f"one or more of: {', '.join(STAGES)}, or all")
+    parser.add_argument('--synthetic', type=float, metavar='SCALE',
+                        help='run on synthetic input of this scale instead of the tutorial data')
+    parser.add_argument('--seed', type=int, default=0, help='seed for --synthetic')
+    parser.add_argument('--map-dir', default='hospital_density_map', help='output directory of the map stage')
+    parser.add_argument('--timing', action='store_true', help='report seconds per stage on stderr')
+    args = parser.parse_args(argv)
+
+    run_all = 'all' in args.stages
+    stages = list(STAGES) if run_all else list(dict.fromkeys(args.stages))
+    inputs = {}
+    # Input name -> load error, so stages sharing a missing input try it once
+    missing = {}
+    skipped = []
+    for stage in stages:
+        input_name, function = STAGES[stage]
+        start = time.perf_counter()
+        if input_name not in inputs and input_name not in missing:
+            try:
+                if args.synthetic is None:
+                    inputs[input_name] = load_input(input_name)
+                else:
+                    inputs[input_name] = synthetic_input(input_name, args.synthetic, seed=args.seed)
+            except (OSError, ImportError) as error:
+                missing[input_name] = error
+        if input_name in missing:
+            message = f'{stage}: cannot load input {input_name!r}: {missing[input_name]}'
+            if not run_all:
+                parser.exit(1, f'{parser.prog}: {message}\n')
+            skipped.append(message)
+            continue
+        options = {'out_dir': args.map_dir} if stage == 'map' else {}
+        result = function(inputs[input_name], **options)
+        seconds = time.perf_counter() - start
+
+        if len(stages) > 1:
+            print(f'== {stage}')
+        print(format_result(stage, result))
+        if len(stages) > 1:
+            print()
+        if args.timing:
+            print(f'{stage}: {seconds:.3f} s', file=sys.stderr)
+
+    for message in skipped:
+        print(f'{parser.prog}: skipped {message}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""SIR and SEIR models solved for a whole batch of parameter sets at once.
+
+``sir_model`` and ``seir_model`` are the tutorial right-hand sides, kept with
+the ``odeint`` signature. ``sir_rhs`` and ``seir_rhs`` are the same equations
+written over a (batch, compartments) array, so one call advances every
+scenario in the batch. ``solve_batch`` integrates them and returns a single
+(batch, times, compartments) trajectory array. ``sir_jacobian`` and
+``seir_jacobian`` give the analytic Jacobians for stiff solvers.
+"""
+import itertools
+
+import numpy as np
+
+SIR_COMPARTMENTS = ('S', 'I', 'R')
+SEIR_COMPARTMENTS = ('S', 'E', 'I', 'R')
+
+
+# Tutorial models (one parameter set, odeint signature)
+def sir_model(variables, time, N, beta, gamma):
+    S, I, R = variables
+    dSdt = -beta * S * I / N
+    dIdt = beta * S * I / N - gamma * I
+    dRdt = gamma * I
+    return [dSdt, dIdt, dRdt]
+
+
+def seir_model(variables, time, N, beta, gamma, sigma):
+    S, E, I, R = variables
+    dSdt = -beta * S * I / N
+    dEdt = beta * S * I / N - sigma * E
+    dIdt = sigma * E - gamma * I
+    dRdt = gamma * I
+    return [dSdt, dEdt, dIdt, dRdt]
+
+
+# Analytic Jacobians of the tutorial models, d(derivatives)/d(variables),
+# in the same odeint signature (usable as odeint's Dfun)
+def sir_jacobian(variables, time, N, beta, gamma):
+    S, I, R = variables
+    return np.array([
+        [-beta * I / N, -beta * S / N, 0.0],
+        [beta * I / N, beta * S / N - gamma, 0.0],
+        [0.0, gamma, 0.0],
+    ])
+
+
+def seir_jacobian(variables, time, N, beta, gamma, sigma):
+    S, E, I, R = variables
+    return np.array([
+        [-beta * I / N, 0.0, -beta * S / N, 0.0],
+        [beta * I / N, -sigma, beta * S / N, 0.0],
+        [0.0, sigma, -gamma, 0.0],
+        [0.0, 0.0, gamma, 0.0],
+    ])
+
+
+# Derivatives of the tutorial models with respect to their rate parameters,
+# one column per parameter in signature order after N (beta, gamma[, sigma])
+def sir_parameter_jacobian(variables, time, N, beta, gamma):
+    S, I, R = variables
+    return np.array([
+        [-S * I / N, 0.0],
+        [S * I / N, -I],
+        [0.0, I],
+    ])
+
+
+def seir_parameter_jacobian(variables, time, N, beta, gamma, sigma):
+    S, E, I, R = variables
+    return np.array([
+        [-S * I / N, 0.0, 0.0],
+        [S * I / N, 0.0, -E],
+        [0.0, -I, E],
+        [0.0, I, 0.0],
+    ])
+
+
+# Batched models: y has shape (batch, compartments), parameters are scalars
+# or arrays of shape (batch,)
+def sir_rhs(y, N, beta, gamma):
+    S, I = y[:, 0], y[:, 1]
+    infection = beta * S * I / N
+    recovery = gamma * I
+    return np.stack([-infection, infection - recovery, recovery], axis=1)
+
+
+def seir_rhs(y, N, beta, gamma, sigma):
+    S, E, I = y[:, 0], y[:, 1], y[:, 2]
+    infection = beta * S * I / N
+    incubation = sigma * E
+    recovery = gamma * I
+    return np.stack([-infection, infection - incubation, incubation - recovery, recovery], axis=1)
+
+
+MODELS = {
+    'sir': (sir_rhs, SIR_COMPARTMENTS, ('N', 'beta', 'gamma')),
+    'seir': (seir_rhs, SEIR_COMPARTMENTS, ('N', 'beta', 'gamma', 'sigma')),
+}
+
+
+def _rk4(rhs, y0, times, args, steps_per_interval):
+    # Written straight into the (batch, times, compartments) result layout
+    batch, compartments = y0.shape
+    trajectory = np.empty((batch, len(times), compartments))
+    trajectory[:, 0] = y = y0
+    for k in range(1, len(times)):
+        h = (times[k] - times[k - 1]) / steps_per_interval
+        for _ in range(steps_per_interval):
+            k1 = rhs(y, *args)
+            k2 = rhs(y + 0.5 * h * k1, *args)
+            k3 = rhs(y + 0.5 * h * k2, *args)
+            k4 = rhs(y + h * k3, *args)
+            y = y + h / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+        trajectory[:, k] = y
+    return trajectory
+
+
+def _solve_ivp(rhs, y0, times, args, method, rtol, atol):
+    from scipy.integrate import solve_ivp
+
+    shape = y0.shape
+
+    def flat_rhs(t, y):
+        return rhs(y.reshape(shape), *args).ravel()
+
+    solution = solve_ivp(flat_rhs, (times[0], times[-1]), y0.ravel(), method=method,
+                         t_eval=times, rtol=rtol, atol=atol)
+    if not solution.success:
+        raise RuntimeError(f"batched solve failed: {solution.message}")
+    # solution.y is (batch * compartments, times); one copy into the result layout
+    return np.ascontiguousarray(solution.y.reshape(shape + (len(times),)).transpose(0, 2, 1))
+
+
+def solve_batch(rhs, y0, times, args, method='rk4', steps_per_interval=4, rtol=1e-6, atol=1e-6):
+    """Integrate a batched right-hand side for every scenario at once.
+
+    `y0` has shape (batch, compartments) and each entry of `args` is a scalar
+    or a (batch,) array. ``method='rk4'`` takes `steps_per_interval` fixed
+    Runge-Kutta steps between output times; any explicit ``solve_ivp``
+    method name (RK45, RK23, DOP853) integrates the flattened batch
+    adaptively instead. Returns an array of shape (batch, times, compartments).
+    """
+    y0 = np.atleast_2d(np.asarray(y0, dtype=float))
+    times = np.asarray(times, dtype=float)
+    batch = y0.shape[0]
+    args = tuple(np.broadcast_to(np.asarray(arg, dtype=float), (batch,)) for arg in args)
+
+    if method == 'rk4':
+        trajectory = _rk4(rhs, y0, times, args, steps_per_interval)
+    elif method in ('RK45', 'RK23', 'DOP853'):
+        trajectory = _solve_ivp(rhs, y0, times, args, method, rtol, atol)
+    else:
+        raise ValueError(f"unknown batch method {method!r}; use 'rk4', 'RK45', 'RK23' or 'DOP853'")
+    return trajectory
+
+
+def solve_model(model, y0, times, method='rk4', **params):
+    """Solve a named model ('sir' or 'seir') for a batch of parameters.
+
+    Parameters are passed by name (N, beta, gamma and, for SEIR, sigma).
+    """
+    rhs, _, param_names = MODELS[model]
+    missing = [name for name in param_names if name not in params]
+    if missing:
+        raise ValueError(f"{model} model needs parameters {missing}")
+    return solve_batch(rhs, y0, times, [params[name] for name in param_names], method=method)
+
+
+def expand_grid(**values):
+    """Cartesian product of parameter values as a dict of equal-length arrays."""
+    names = list(values)
+    combos = np.array(list(itertools.product(*(np.atleast_1d(values[name]) for name in names))), dtype=float)
+    return {name: combos[:, i] for i, name in enumerate(names)}
@@ -0,0 +1,180 @@
+"""Streaming 2x2 (and stratified 2x2xK) contingency tables.
+
+The odds-ratio and relative-risk tutorials load the whole survey, classify
+each row with ``.apply`` and then call ``pd.crosstab``. ``count_file`` reads
+the file in chunks instead, classifies exposure and outcome with vectorized
+string operations and keeps only running counts, so memory stays constant in
+the number of rows. With ``workers`` set, the file is split into byte ranges
+that are counted in separate processes and the partial counts are merged.
+
+Tables follow the tutorials' layout: rows are exposed / unexposed
+(smoker / non-smoker) and columns are outcome yes / no. Rows with any other
+exposure value, or none, are dropped, as in the tutorials' crosstab.
+
+Byte-range splitting assumes one record per line, i.e. no quoted fields
+containing newlines.
+"""
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Key of the unstratified table in the dicts returned below
+TOTAL = None
+
+
+def outcome_pattern(codes):
+    """Regex matching any of `codes` as a whole ``;``-separated token."""
+    alternatives = '|'.join(re.escape(code) for code in codes)
+    return f'(?:^|;)(?:{alternatives})(?:;|$)'
+
+
+def count_chunk(chunk, exposure, exposed_value, unexposed_value, outcome, outcome_codes, strata=None):
+    """2x2 counts for one chunk, as a dict of stratum -> (2, 2) int array.
+
+    Rows whose exposure is neither `exposed_value` nor `unexposed_value`
+    (missing, 'former smoker', ...) are left out, as the tutorials'
+    categorical crosstab does. The outcome column may hold strings or
+    categoricals (as ``epi.data`` returns them); a missing value counts as
+    no outcome. Without `strata` the only key is ``TOTAL``.
+    """
+    exposed = (chunk[exposure] == exposed_value).to_numpy()
+    known = exposed | (chunk[exposure] == unexposed_value).to_numpy()
+    chunk = chunk[known]
+    exposed = exposed[known]
+    codes = chunk[outcome].astype('string')
+    has_outcome = codes.str.contains(outcome_pattern(outcome_codes), regex=True, na=False).to_numpy(dtype=bool)
+    if strata is None:
+        return {TOTAL: cell_counts(exposed, has_outcome)[1][0]}
+    labels, counts = cell_counts(exposed, has_outcome, chunk[strata].to_numpy())
+    return {label: counts[i] for i, label in enumerate(labels.tolist())}
+
+
+def cell_counts(exposed, has_outcome, strata=None):
+    """Stratum labels and (strata, 2, 2) counts from boolean exposure/outcome arrays.
+
+    Everything is counted in one ``bincount`` over a combined stratum/cell
+    index. Without `strata` there is a single stratum labelled ``TOTAL``.
+    Rows with a missing stratum label are left out, as ``groupby`` does.
+    """
+    exposed = np.asarray(exposed, dtype=bool)
+    has_outcome = np.asarray(has_outcome, dtype=bool)
+    # Cell index: 0 = exposed & outcome, 1 = exposed & no outcome, 2 and 3 for unexposed
+    cell = (~exposed).astype(np.int64) * 2 + (~has_outcome).astype(np.int64)
+    if strata is None:
+        return np.array([TOTAL], dtype=object), np.bincount(cell, minlength=4).reshape(1, 2, 2)
+    # factorize rather than np.unique: it takes NaN labels (code -1) without
+    # trying to compare them with strings
+    stratum, labels = pd.factorize(np.asarray(strata), sort=True)
+    labelled = stratum >= 0
+    counts = np.bincount(stratum[labelled] * 4 + cell[labelled], minlength=len(labels) * 4).reshape(-1, 2, 2)
+    return np.asarray(labels), counts
+
+
+def merge_counts(parts):
+    """Sum a sequence of stratum -> table dicts."""
+    merged = {}
+    for part in parts:
+        for key, table in part.items():
+            merged[key] = merged[key] + table if key in merged else table.copy()
+    return merged
+
+
+def byte_ranges(path, n):
+    """Split the data lines of `path` (after the header) into `n` byte ranges."""
+    with open(path, 'rb') as handle:
+        handle.readline()
+        first = handle.tell()
+    size = os.path.getsize(path)
+    bounds = np.linspace(first, size, n + 1).astype(int)
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _read_blocks(path, start, end, block_bytes):
+    # Yield blocks of whole lines whose first byte lies in [start, end)
+    with open(path, 'rb') as handle:
+        handle.seek(max(start - 1, 0))
+        if start > 0:
+            handle.readline()
+        while handle.tell() < end:
+            block = handle.read(min(block_bytes, end - handle.tell()))
+            if not block:
+                break
+            if not block.endswith(b'\n'):
+                block += handle.readline()
+            yield block
+
+
+def count_range(path, start, end, names, exposure, exposed_value, unexposed_value, outcome, outcome_codes,
+                strata=None, block_bytes=64 << 20):
+    """Counts for the lines of `path` starting inside the byte range [start, end)."""
+    usecols = [exposure, outcome] + ([strata] if strata is not None else [])
+    parts = []
+    for block in _read_blocks(path, start, end, block_bytes):
+        chunk = pd.read_csv(io.BytesIO(block), header=None, names=names, usecols=usecols,
+                            dtype={exposure: str, outcome: str})
+        parts.append(count_chunk(chunk, exposure, exposed_value, unexposed_value, outcome, outcome_codes, strata))
+        parts = [merge_counts(parts)]
+    return merge_counts(parts)
+
+
+def count_file(path, exposure='smoking_status', exposed_value='smoker', outcome='diagnosis_codes',
+               outcome_codes=('C34.90', 'C96.29'), strata=None, chunksize=1_000_000, workers=None,
+               unexposed_value='non-smoker'):
+    """Stream `path` and return stratum -> 2x2 count tables.
+
+    Rows with any exposure other than `exposed_value` or `unexposed_value`
+    are not counted.
+
+    Without `workers` the file is read sequentially in `chunksize` rows.
+    With `workers`, it is split into that many byte ranges counted in a
+    process pool.
+    """
+    if not workers:
+        usecols = [exposure, outcome] + ([strata] if strata is not None else [])
+        totals = {}
+        reader = pd.read_csv(path, usecols=usecols, chunksize=chunksize, dtype={exposure: str, outcome: str})
+        for chunk in reader:
+            counts = count_chunk(chunk, exposure, exposed_value, unexposed_value, outcome, outcome_codes, strata)
+            totals = merge_counts([totals, counts])
+        return totals
+
+    names = list(pd.read_csv(path, nrows=0).columns)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(count_range, path, start, end, names, exposure, exposed_value, unexposed_value, outcome,
+                        outcome_codes, strata)
+            for start, end in byte_ranges(path, workers)
+        ]
+        return merge_counts(future.result() for future in futures)
+
+
+def as_crosstab(table, exposure_labels=('smoker', 'non-smoker'), outcome_labels=('yes', 'no')):
+    """A 2x2 table as the DataFrame ``pd.crosstab`` gives in the tutorials."""
+    return pd.DataFrame(table, index=pd.Index(exposure_labels, name='smoking_status'),
+                        columns=pd.Index(outcome_labels, name='lung_cancer'))
+
+
+def odds_ratio(table, alternative='two-sided'):
+    """Sample odds ratio and Fisher's exact test p-value."""
+    from scipy.stats import fisher_exact
+
+    result = fisher_exact(np.asarray(table), alternative=alternative)
+    return float(result[0]), float(result[1])
+
+
+def relative_risk(table, alpha=0.05):
+    """Risk ratio of exposed vs unexposed with a log-normal confidence interval.
+
+    Matches ``statsmodels`` ``Table2x2.riskratio`` and ``riskratio_confint``.
+    """
+    from scipy.special import ndtri
+
+    (a, b), (c, d) = np.asarray(table, dtype=float)
+    rr = (a / (a + b)) / (c / (c + d))
+    se = np.sqrt(1 / a - 1 / (a + b) + 1 / c - 1 / (c + d))
+    z = ndtri(1 - alpha / 2)
+    return float(rr), float(rr * np.exp(-z * se)), float(rr * np.exp(z * se))
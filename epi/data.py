@@ -0,0 +1,248 @@
+"""Columnar, memory-mapped cache for the tutorial data sets.
+
+Each source CSV is parsed once into a cache directory holding one ``.npy``
+file per column. Numeric columns are stored as they are; text columns are
+categorical-encoded as integer codes plus a small array of categories. Later
+loads memory-map only the requested columns instead of re-tokenizing the
+CSV, so repeated runs and parallel jobs share the same pages.
+
+A cache entry is reused while the source file's size and modification time
+match. When they do not, the file's SHA-256 is compared before rebuilding,
+so touching a file without changing it does not force a rebuild.
+
+``open_entry`` and ``write_entry`` manage these entries for any derived
+data (``epi.spatial`` caches polygons the same way). An entry directory
+holds ``meta.json`` and one ``v-*`` version directory per build. A rebuild
+writes a new version and then renames a new ``meta.json`` over the old
+one, so readers see either the old version or the new one, never a
+missing or half-written entry. The version a rebuild
+replaces is kept for readers that are still loading it; older ones are
+removed.
+
+``read_csv`` is a drop-in for ``pandas.read_csv`` in the tutorial scripts:
+the same frame (text columns as strings, writable arrays), served from the
+cache.
+
+The cache lives in ``$EPI_CACHE_DIR`` or ``.epi_cache`` at the repository
+root.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Data sets used by the tutorial scripts, relative to the repository root.
+# The depression and smoking CSVs are duplicated across tutorial folders;
+# one copy of each is enough for the cache.
+DATASETS = {
+    'depression': 'Prevalence_Rate_Python/Depression_and_Population_Data.csv',
+    'smoking_survey': 'Odds_Ratio/smoking_survey.csv',
+    'belfast_suicide': 'T-Tests in Python/Belfast_Suicide_Counts.csv',
+    'disease_distance': 'Correlation/Data/disease_dataset.csv',
+}
+
+# Extra read_csv arguments per data set
+READ_OPTIONS = {
+    'smoking_survey': {'index_col': 0},
+}
+
+_loaded = {}
+
+
+def cache_dir():
+    return os.environ.get('EPI_CACHE_DIR', os.path.join(ROOT, '.epi_cache'))
+
+
+def source_path(name):
+    """Absolute path of a registered data set, or `name` itself if it is a path."""
+    if name in DATASETS:
+        return os.path.join(ROOT, DATASETS[name])
+    return os.path.abspath(name)
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _entry_dir(path):
+    # One cache entry per source path
+    key = hashlib.sha256(path.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_dir(), f'{os.path.splitext(os.path.basename(path))[0]}-{key}')
+
+
+def _read_meta(entry):
+    try:
+        with open(os.path.join(entry, 'meta.json')) as handle:
+            return json.load(handle)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_meta(entry, meta):
+    # Renamed over meta.json, so readers never see a partly written file
+    handle, tmp_path = tempfile.mkstemp(dir=entry, suffix='.tmp')
+    with os.fdopen(handle, 'w') as tmp:
+        json.dump(meta, tmp, indent=1)
+    os.replace(tmp_path, os.path.join(entry, 'meta.json'))
+
+
+def _publish(entry, version, meta):
+    """Point `entry` at its `version` directory and drop versions older than the one replaced."""
+    previous = _read_meta(entry) or {}
+    meta['version'] = version
+    _write_meta(entry, meta)
+    # Versions newer than ours belong to builds still in progress
+    current = os.path.getmtime(os.path.join(entry, version))
+    keep = {version, previous.get('version')}
+    for name in os.listdir(entry):
+        path = os.path.join(entry, name)
+        if name.startswith('v-') and name not in keep and os.path.getmtime(path) < current:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def fingerprint(path):
+    """Size, modification time and SHA-256 of `path`, as recorded in an entry's ``meta.json``."""
+    stat = os.stat(path)
+    return {'path': path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': file_hash(path)}
+
+
+def open_entry(entry, files):
+    """Version directory and metadata of `entry` if it is fresh for source `files`, else (None, None).
+
+    An entry is fresh while it was built from exactly `files` and each still
+    has its recorded size and modification time, or a new timestamp but the
+    same SHA-256. New timestamps are written back so the next check skips
+    the hash.
+    """
+    meta = _read_meta(entry)
+    if meta is None or 'version' not in meta or 'files' not in meta:
+        return None, None
+    recorded = meta['files']
+    if [item['path'] for item in recorded] != list(files):
+        return None, None
+    changed = False
+    for item in recorded:
+        stat = os.stat(item['path'])
+        if (item['size'], item['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+            continue
+        if item['size'] != stat.st_size or item['sha256'] != file_hash(item['path']):
+            return None, None
+        item['mtime_ns'] = stat.st_mtime_ns
+        changed = True
+    if changed:
+        _write_meta(entry, meta)
+    return os.path.join(entry, meta['version']), meta
+
+
+def write_entry(entry, files, write):
+    """Build a new version of `entry` from source `files` and publish it.
+
+    ``write(directory)`` fills the new version directory and returns the
+    extra metadata to record with the files' fingerprints. Returns the
+    version directory and its metadata.
+    """
+    os.makedirs(entry, exist_ok=True)
+    directory = tempfile.mkdtemp(prefix='v-', dir=entry)
+    meta = {'files': [fingerprint(path) for path in files], **write(directory)}
+    _publish(entry, os.path.basename(directory), meta)
+    return directory, meta
+
+
+def _write_columns(frame, directory):
+    columns = []
+    for i, name in enumerate(frame.columns):
+        series = frame[name]
+        column = {'name': str(name), 'file': f'col-{i:04d}.npy'}
+        if pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+            np.save(os.path.join(directory, column['file']), series.to_numpy())
+            column['kind'] = 'numeric'
+        else:
+            codes, categories = pd.factorize(series, sort=True)
+            # Smallest signed integer type that holds every code (and -1 for missing)
+            dtype = np.int8 if len(categories) < 2**7 else np.int16 if len(categories) < 2**15 else np.int32
+            np.save(os.path.join(directory, column['file']), codes.astype(dtype))
+            column['categories'] = f'cat-{i:04d}.npy'
+            np.save(os.path.join(directory, column['categories']), np.asarray(categories, dtype=str))
+            column['kind'] = 'categorical'
+        columns.append(column)
+    return columns
+
+
+def build(name, **read_options):
+    """Parse the source CSV and write a new version of its cache entry.
+
+    Returns the version directory and its metadata.
+    """
+    path = source_path(name)
+    options = dict(READ_OPTIONS.get(name, {}), **read_options)
+    frame = pd.read_csv(path, **options)
+    if options.get('index_col') is not None:
+        frame = frame.reset_index(drop=True)
+
+    def write(directory):
+        return {'source': path, 'rows': len(frame), 'columns': _write_columns(frame, directory)}
+
+    return write_entry(_entry_dir(path), [path], write)
+
+
+def load(name, columns=None, mmap=True, refresh=False):
+    """Load a data set from the columnar cache, building it if stale.
+
+    `name` is a key of ``DATASETS`` or a path to a CSV. Only `columns` are
+    read (all columns when None). With ``mmap=True`` numeric columns and
+    category codes are memory-mapped read-only.
+    """
+    path = source_path(name)
+    directory, meta = (None, None) if refresh else open_entry(_entry_dir(path), [path])
+    if directory is None:
+        directory, meta = build(name)
+
+    by_name = {column['name']: column for column in meta['columns']}
+    wanted = list(by_name) if columns is None else list(columns)
+    unknown = [column for column in wanted if column not in by_name]
+    if unknown:
+        raise KeyError(f"{name} has no columns {unknown}")
+
+    mmap_mode = 'r' if mmap else None
+    data = {}
+    for column_name in wanted:
+        column = by_name[column_name]
+        values = np.load(os.path.join(directory, column['file']), mmap_mode=mmap_mode)
+        if column['kind'] == 'categorical':
+            categories = np.load(os.path.join(directory, column['categories']))
+            values = pd.Categorical.from_codes(values, categories=categories)
+        data[column_name] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def cached(name, columns=None):
+    """``load`` memoized for the life of the process, for stages that share data."""
+    key = (source_path(name), None if columns is None else tuple(columns))
+    if key not in _loaded:
+        _loaded[key] = load(name, columns=columns)
+    return _loaded[key]
+
+
+def read_csv(path):
+    """``pandas.read_csv(path)`` served from the cache, for the tutorial scripts.
+
+    Arrays are writable copies and text columns come back with the dtype of
+    their categories (pandas' default string dtype) rather than as
+    categoricals, so the scripts can treat the frame as one they parsed
+    themselves.
+    """
+    frame = load(path, mmap=False)
+    for name in frame.columns:
+        if isinstance(frame[name].dtype, pd.CategoricalDtype):
+            frame[name] = frame[name].astype(frame[name].cat.categories.dtype)
+    return frame
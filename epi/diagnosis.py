@@ -0,0 +1,89 @@
+"""Match many outcome definitions against ``;``-joined diagnosis code strings.
+
+The tutorials test ``"C34.90" in codes`` row by row, which also matches
+longer codes such as C34.901. ``CodeIndex`` tokenizes the column once into
+a sparse (rows x codes) matrix over the vocabulary of distinct codes. Outcome
+definitions are resolved against the vocabulary, and every outcome flag is
+then computed together with one sparse matrix product.
+
+An outcome definition is a list of patterns. A pattern ending in ``*`` is a
+prefix (``'C34*'`` matches C34, C34.90 and C34.901); any other pattern is an
+exact code::
+
+    index = CodeIndex.from_series(survey['diagnosis_codes'])
+    flags = index.match({'lung_cancer': ['C34.90', 'C96.29'], 'any_c34': ['C34*']})
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class CodeIndex:
+    """Sparse row x code incidence matrix over a sorted code vocabulary."""
+
+    def __init__(self, matrix, vocabulary, index=None):
+        self.matrix = matrix.tocsr()
+        self.vocabulary = np.asarray(vocabulary, dtype=str)
+        self.index = index
+
+    @classmethod
+    def from_series(cls, codes, sep=';'):
+        """Tokenize a column of ``sep``-joined code strings.
+
+        Only the distinct strings are split, which matters when many rows
+        share the same code combination; rows are then mapped onto them.
+        """
+        row_strings, strings = pd.factorize(codes, sort=False)
+        tokens = pd.Series(strings, dtype=object).str.split(sep).explode().str.strip()
+        tokens = tokens[tokens.notna() & (tokens != '')]
+        code_ids, vocabulary = pd.factorize(tokens, sort=True)
+
+        by_string = sparse.csr_matrix(
+            (np.ones(len(code_ids), dtype=bool), (tokens.index.to_numpy(), code_ids)),
+            shape=(len(strings), len(vocabulary)),
+        )
+        # Missing strings (code -1) get an empty row
+        empty = sparse.csr_matrix((1, len(vocabulary)), dtype=bool)
+        by_string = sparse.vstack([by_string, empty]).tocsr()
+        matrix = by_string[np.where(row_strings < 0, len(strings), row_strings)]
+        return cls(matrix, np.asarray(vocabulary), index=getattr(codes, 'index', None))
+
+    def resolve(self, patterns):
+        """Vocabulary positions matched by a list of exact codes and ``*`` prefixes."""
+        positions = []
+        for pattern in patterns:
+            if pattern.endswith('*'):
+                prefix = pattern[:-1]
+                # The vocabulary is sorted, so a prefix covers one contiguous range
+                low = np.searchsorted(self.vocabulary, prefix, side='left')
+                high = np.searchsorted(self.vocabulary, prefix + '\U0010ffff', side='left')
+                positions.append(np.arange(low, high))
+            else:
+                position = np.searchsorted(self.vocabulary, pattern)
+                if position < len(self.vocabulary) and self.vocabulary[position] == pattern:
+                    positions.append(np.array([position]))
+        if not positions:
+            return np.array([], dtype=np.int64)
+        return np.unique(np.concatenate(positions))
+
+    def match(self, definitions):
+        """Boolean DataFrame with one column per outcome definition."""
+        names = list(definitions)
+        rows, columns = [], []
+        for column, name in enumerate(names):
+            positions = self.resolve(definitions[name])
+            rows.append(positions)
+            columns.append(np.full(len(positions), column))
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+        columns = np.concatenate(columns) if columns else np.array([], dtype=np.int64)
+        selector = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+            shape=(len(self.vocabulary), len(names)),
+        )
+        hits = (self.matrix.astype(np.int32) @ selector).toarray() > 0
+        return pd.DataFrame(hits, columns=names, index=self.index)
+
+    def has_any(self, patterns):
+        """Boolean array: does each row carry any of `patterns`?"""
+        positions = self.resolve(patterns)
+        return np.asarray(self.matrix[:, positions].sum(axis=1)).ravel() > 0
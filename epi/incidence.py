@@ -0,0 +1,63 @@
+"""Incidence rates and year-over-year changes.
+
+The tutorial script computes the change in incidence rate with a loop over
+regions and rows. ``lag_change`` does the same thing for any grouping keys
+and lag window in one sorted pass over the data.
+"""
+import numpy as np
+import pandas as pd
+
+CASES = 'Diagnosed Depression Cases by Region Year'
+POPULATION = 'Total Population'
+RATE = 'Incidence Rate (per 1000)'
+CHANGE = 'Change in Incidence Rate (per 1000)'
+
+
+def incidence_rate(cases, population, per=1000):
+    """Cases per `per` population."""
+    return cases / population * per
+
+
+def _as_list(keys):
+    if isinstance(keys, (list, tuple)):
+        return list(keys)
+    return [keys]
+
+
+def lag_change(data, value, by, order, lag=1, fill_value=0.0):
+    """Difference between `value` and its value `lag` steps earlier within each group.
+
+    Rows are ordered by `order` inside each `by` group. Rows without a
+    predecessor `lag` steps back get `fill_value`. The result is aligned
+    with ``data.index`` so it can be assigned straight back as a column.
+    """
+    if lag < 1:
+        raise ValueError(f"lag must be a positive integer, got {lag}")
+    by = _as_list(by)
+    order = _as_list(order)
+
+    # One integer code per group, then a single stable sort on (group, order)
+    group_ids = data.groupby(by, sort=False, dropna=False).ngroup().to_numpy()
+    sort_keys = [pd.factorize(data[column], sort=True)[0] for column in reversed(order)]
+    positions = np.lexsort(sort_keys + [group_ids])
+
+    values = data[value].to_numpy(dtype=float)[positions]
+    groups = group_ids[positions]
+
+    # Compare each sorted row with the row `lag` places earlier; only keep
+    # the difference when both rows belong to the same group
+    change = np.full(len(values), fill_value, dtype=float)
+    same_group = groups[lag:] == groups[:-lag]
+    change[lag:] = np.where(same_group, values[lag:] - values[:-lag], fill_value)
+
+    # Scatter back to the original row order
+    result = np.empty_like(change)
+    result[positions] = change
+    return pd.Series(result, index=data.index, name=value)
+
+
+def add_incidence_columns(data, by='Region', order='Year', lag=1, per=1000):
+    """Add the incidence rate and its change columns used by the tutorial script."""
+    data[RATE] = incidence_rate(data[CASES].astype(float), data[POPULATION].astype(float), per=per)
+    data[CHANGE] = lag_change(data, RATE, by=by, order=order, lag=lag)
+    return data
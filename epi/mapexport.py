@@ -0,0 +1,199 @@
+"""Lightweight, level-of-detail export of the county choropleth.
+
+``m.save(...)`` in the Leaflet tutorial inlines the full-resolution 500k
+county geometries as GeoJSON and styles them through a Python
+``style_function`` called once per feature. ``export_map`` writes a small
+Leaflet page instead:
+
+* geometries are simplified once per zoom level with coverage
+  simplification, so neighbouring counties keep matching borders
+  (per-polygon ``simplify(preserve_topology=True)`` on shapely < 2.1);
+* each level is written as quantized, delta-encoded TopoJSON into
+  ``<out_dir>/levels/z<zoom>.js`` and loaded only when the map reaches that
+  zoom;
+* fill colour and opacity are precomputed as feature properties (see
+  ``epi.choropleth.ColorBins.fill``), so the page styles features by
+  property lookup with no per-feature callback.
+
+The level files are plain scripts that register their TopoJSON on
+``window.EPI_LEVELS``, so the page also opens straight from disk without a
+web server.
+"""
+import json
+import os
+
+import numpy as np
+import shapely
+
+DEFAULT_ZOOMS = (3, 5, 7, 9)
+
+LEAFLET_JS = 'https://unpkg.com/leaflet@1.9.4/dist/leaflet.js'
+LEAFLET_CSS = 'https://unpkg.com/leaflet@1.9.4/dist/leaflet.css'
+TOPOJSON_JS = 'https://unpkg.com/topojson-client@3'
+
+
+def pixel_size(zoom):
+    """Degrees of longitude covered by one 256-pixel-tile pixel at `zoom`."""
+    return 360.0 / (256 * 2 ** zoom)
+
+
+def simplify(geometries, tolerance):
+    """Simplify polygons while keeping shared borders shared where shapely allows it."""
+    geometries = np.asarray(geometries, dtype=object)
+    if hasattr(shapely, 'coverage_simplify'):
+        return shapely.coverage_simplify(geometries, tolerance)
+    return shapely.simplify(geometries, tolerance, preserve_topology=True)
+
+
+def to_topojson(geometries, properties, scale, object_name='counties'):
+    """Quantized TopoJSON topology for polygons with per-feature `properties`.
+
+    Coordinates are snapped to a grid of `scale` degrees and each ring is
+    delta-encoded as its own arc.
+    """
+    geometries = np.asarray(geometries, dtype=object)
+    parts, part_owner = shapely.get_parts(geometries, return_index=True)
+    rings, ring_owner = shapely.get_rings(parts, return_index=True)
+    coords, coord_owner = shapely.get_coordinates(rings, return_index=True)
+
+    bounds = shapely.total_bounds(geometries)
+    translate = bounds[:2]
+    quantized = np.round((coords - translate) / scale).astype(np.int64)
+
+    # Delta-encode within each ring, dropping points that collapse onto the
+    # previous one after quantization
+    starts = np.r_[True, coord_owner[1:] != coord_owner[:-1]]
+    deltas = np.diff(quantized, axis=0, prepend=quantized[:1])
+    deltas[starts] = quantized[starts]
+    keep = starts | np.any(deltas != 0, axis=1)
+    deltas, coord_owner = deltas[keep], coord_owner[keep]
+    boundaries = np.flatnonzero(np.r_[True, coord_owner[1:] != coord_owner[:-1]])[1:]
+    arcs = [arc.tolist() for arc in np.split(deltas, boundaries)]
+
+    # Rebuild the nesting: feature -> polygons -> rings -> arc index
+    polygon_rings = [[] for _ in range(len(parts))]
+    for ring, part in enumerate(ring_owner):
+        polygon_rings[part].append([ring])
+    feature_polygons = [[] for _ in range(len(geometries))]
+    for part, feature in enumerate(part_owner):
+        feature_polygons[feature].append(polygon_rings[part])
+
+    features = []
+    for polygons, props in zip(feature_polygons, properties):
+        if len(polygons) == 1:
+            features.append({'type': 'Polygon', 'arcs': polygons[0], 'properties': props})
+        else:
+            features.append({'type': 'MultiPolygon', 'arcs': polygons, 'properties': props})
+
+    return {
+        'type': 'Topology',
+        'transform': {'scale': [scale, scale], 'translate': translate.tolist()},
+        'objects': {object_name: {'type': 'GeometryCollection', 'geometries': features}},
+        'arcs': arcs,
+    }
+
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<link rel="stylesheet" href="{leaflet_css}">
+<script src="{leaflet_js}"></script>
+<script src="{topojson_js}"></script>
+<style>html, body, #map {{ height: 100%; margin: 0; }}</style>
+</head>
+<body>
+<div id="map"></div>
+{legend}
+<script>
+window.EPI_LEVELS = {{}};
+var zooms = {zooms};
+var map = L.map('map').setView({center}, {zoom});
+L.tileLayer('https://{{s}}.tile.openstreetmap.org/{{z}}/{{x}}/{{y}}.png', {{
+    attribution: '&copy; OpenStreetMap contributors'
+}}).addTo(map);
+var features = {{}};
+var layer = null;
+
+function levelFor(zoom) {{
+    var level = zooms[0];
+    zooms.forEach(function (z) {{ if (z <= zoom) level = z; }});
+    return level;
+}}
+
+function show(level) {{
+    if (!(level in features)) {{
+        if (!(level in window.EPI_LEVELS)) {{
+            var script = document.createElement('script');
+            script.src = 'levels/z' + level + '.js';
+            script.onload = function () {{ show(level); }};
+            document.head.appendChild(script);
+            return;
+        }}
+        var topology = window.EPI_LEVELS[level];
+        features[level] = topojson.feature(topology, topology.objects.{object_name});
+    }}
+    if (level !== levelFor(map.getZoom())) return;
+    if (layer) map.removeLayer(layer);
+    layer = L.geoJSON(features[level], {{
+        style: function (feature) {{
+            return {{fillColor: feature.properties.fill_color, fillOpacity: feature.properties.fill_opacity,
+                     color: 'black', weight: 1}};
+        }},
+        onEachFeature: function (feature, featureLayer) {{
+            if (feature.properties.tooltip) featureLayer.bindTooltip(feature.properties.tooltip);
+        }}
+    }}).addTo(map);
+}}
+
+map.on('zoomend', function () {{ show(levelFor(map.getZoom())); }});
+show(levelFor(map.getZoom()));
+</script>
+</body>
+</html>
+"""
+
+
+def export_map(polygons, out_dir, fill_colors, fill_opacity, tooltips=None, zooms=DEFAULT_ZOOMS,
+               legend_html='', title='County map', center=(39.8283, -98.5795), zoom=5,
+               object_name='counties'):
+    """Write ``index.html`` and one TopoJSON level per zoom into `out_dir`.
+
+    `polygons` is a GeoDataFrame (reprojected to EPSG:4326 if needed);
+    `fill_colors`, `fill_opacity` and the optional `tooltips` are
+    per-feature arrays in the same order. Level `z` is simplified to one
+    pixel at that zoom and quantized to half a pixel. Returns a dict of
+    bytes written per file.
+    """
+    if polygons.crs is not None and polygons.crs.to_epsg() != 4326:
+        polygons = polygons.to_crs(epsg=4326)
+    geometries = polygons.geometry.to_numpy()
+    fill_colors = np.asarray(fill_colors)
+    fill_opacity = np.asarray(fill_opacity, dtype=float)
+    tooltips = [None] * len(geometries) if tooltips is None else list(tooltips)
+    properties = [
+        {'fill_color': color, 'fill_opacity': opacity, 'tooltip': tooltip}
+        for color, opacity, tooltip in zip(fill_colors.tolist(), fill_opacity.tolist(), tooltips)
+    ]
+
+    os.makedirs(os.path.join(out_dir, 'levels'), exist_ok=True)
+    written = {}
+    for level in zooms:
+        tolerance = pixel_size(level)
+        topology = to_topojson(simplify(geometries, tolerance), properties, tolerance / 2, object_name)
+        path = os.path.join(out_dir, 'levels', f'z{level}.js')
+        with open(path, 'w') as handle:
+            handle.write(f'window.EPI_LEVELS[{level}] = ')
+            json.dump(topology, handle, separators=(',', ':'))
+            handle.write(';\n')
+        written[path] = os.path.getsize(path)
+
+    page = PAGE.format(title=title, leaflet_css=LEAFLET_CSS, leaflet_js=LEAFLET_JS, topojson_js=TOPOJSON_JS,
+                       legend=legend_html, zooms=json.dumps(sorted(zooms)), center=json.dumps(list(center)),
+                       zoom=zoom, object_name=object_name)
+    path = os.path.join(out_dir, 'index.html')
+    with open(path, 'w') as handle:
+        handle.write(page)
+    written[path] = os.path.getsize(path)
+    return written
@@ -0,0 +1,152 @@
+"""Agent-based SIR/SEIR on a contact network held in compact arrays.
+
+The contact graph is stored as CSR arrays (``indptr`` and int32
+``indices``) and every agent's compartment is one uint8 (0 = S, 1 = E,
+2 = I, 3 = R); there are no per-agent Python objects. The simulation keeps
+explicit lists of exposed and infectious agents, so a daily step costs
+O(exposed + infectious + edges leaving the infectious) rather than
+O(population):
+
+* every edge from an infectious agent transmits with probability
+  ``1 - exp(-beta)``; susceptible targets become exposed (SEIR) or
+  infectious (SIR) the next day;
+* exposed agents become infectious with probability ``1 - exp(-sigma)``;
+* infectious agents recover with probability ``1 - exp(-gamma)``.
+
+Graphs can be saved as ``.npy`` files and memory-mapped, so parallel
+replicates in ``run_replicates`` share one copy of the graph. Each
+replicate gets its own ``SeedSequence`` child, which makes results
+reproducible regardless of how replicates are spread over processes.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SUSCEPTIBLE, EXPOSED, INFECTIOUS, RECOVERED = 0, 1, 2, 3
+
+
+def csr_from_edges(sources, targets, n, symmetric=True):
+    """CSR ``indptr``/``indices`` arrays from an edge list, dropping self-loops."""
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    keep = sources != targets
+    sources, targets = sources[keep], targets[keep]
+    if symmetric:
+        sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+    order = np.argsort(sources, kind='stable')
+    indices = targets[order].astype(np.int32)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=n), out=indptr[1:])
+    return indptr, indices
+
+
+def random_graph(n, mean_degree=10, seed=None):
+    """Erdos-Renyi-style random graph with about `mean_degree` contacts per agent."""
+    rng = np.random.default_rng(seed)
+    m = int(n * mean_degree / 2)
+    return csr_from_edges(rng.integers(0, n, m), rng.integers(0, n, m), n)
+
+
+def save_graph(directory, indptr, indices):
+    os.makedirs(directory, exist_ok=True)
+    np.save(os.path.join(directory, 'indptr.npy'), indptr)
+    np.save(os.path.join(directory, 'indices.npy'), indices)
+
+
+def load_graph(directory, mmap=True):
+    mode = 'r' if mmap else None
+    return (np.load(os.path.join(directory, 'indptr.npy'), mmap_mode=mode),
+            np.load(os.path.join(directory, 'indices.npy'), mmap_mode=mode))
+
+
+def _neighbours(indptr, indices, nodes):
+    # All neighbours of `nodes`, concatenated, without a Python loop
+    starts = indptr[nodes]
+    degrees = indptr[nodes + 1] - starts
+    total = int(degrees.sum())
+    if total == 0:
+        return np.empty(0, dtype=indices.dtype)
+    offsets = np.repeat(starts - np.cumsum(degrees) + degrees, degrees)
+    return indices[offsets + np.arange(total)]
+
+
+def simulate(indptr, indices, days, beta, gamma, sigma=None, initial_infected=10, seed=None):
+    """Run one replicate; returns daily (days + 1, 4) counts of S, E, I, R.
+
+    ``sigma=None`` runs SIR (no exposed stage). `beta` is the per-contact
+    daily transmission rate.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(indptr) - 1
+    state = np.zeros(n, dtype=np.uint8)
+    infectious = rng.choice(n, size=min(initial_infected, n), replace=False)
+    exposed = np.empty(0, dtype=np.int64)
+    state[infectious] = INFECTIOUS
+
+    p_transmit = 1 - np.exp(-beta)
+    p_recover = 1 - np.exp(-gamma)
+    p_onset = None if sigma is None else 1 - np.exp(-sigma)
+
+    counts = np.zeros((days + 1, 4), dtype=np.int64)
+    counts[0] = [n - len(infectious), 0, len(infectious), 0]
+    for day in range(1, days + 1):
+        # Transmission along edges leaving the infectious frontier
+        contacts = _neighbours(indptr, indices, infectious)
+        contacts = contacts[rng.random(len(contacts)) < p_transmit]
+        infected = np.unique(contacts[state[contacts] == SUSCEPTIBLE])
+
+        recovered = rng.random(len(infectious)) < p_recover
+        state[infectious[recovered]] = RECOVERED
+        still_infectious = infectious[~recovered]
+
+        if p_onset is None:
+            state[infected] = INFECTIOUS
+            infectious = np.concatenate([still_infectious, infected])
+        else:
+            onset = rng.random(len(exposed)) < p_onset
+            state[exposed[onset]] = INFECTIOUS
+            state[infected] = EXPOSED
+            infectious = np.concatenate([still_infectious, exposed[onset]])
+            exposed = np.concatenate([exposed[~onset], infected])
+
+        previous = counts[day - 1]
+        counts[day] = [
+            previous[0] - len(infected),
+            len(exposed),
+            len(infectious),
+            previous[3] + int(recovered.sum()),
+        ]
+        if len(infectious) == 0 and len(exposed) == 0:
+            counts[day + 1:] = counts[day]
+            break
+    return counts
+
+
+def steps_run(counts):
+    """Number of daily steps ``simulate`` took to produce `counts`.
+
+    The simulation stops on the first day with no exposed or infectious
+    agents and repeats that day's counts to the end of the horizon.
+    """
+    active = counts[1:, EXPOSED] + counts[1:, INFECTIOUS]
+    ended = np.flatnonzero(active == 0)
+    return int(ended[0]) + 1 if len(ended) else len(counts) - 1
+
+
+def _run_replicate(graph_dir, days, beta, gamma, sigma, initial_infected, seed):
+    indptr, indices = load_graph(graph_dir)
+    return simulate(indptr, indices, days, beta, gamma, sigma, initial_infected, seed)
+
+
+def run_replicates(graph_dir, replicates, days, beta, gamma, sigma=None, initial_infected=10,
+                   seed=None, workers=None):
+    """Independent replicates on a saved graph; returns (replicates, days + 1, 4) counts."""
+    seeds = np.random.SeedSequence(seed).spawn(replicates)
+    args = [(graph_dir, days, beta, gamma, sigma, initial_infected, child) for child in seeds]
+    if workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_replicate, *zip(*args)))
+    else:
+        results = [_run_replicate(*arg) for arg in args]
+    return np.stack(results)
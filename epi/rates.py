@@ -0,0 +1,106 @@
+"""Prevalence and incidence rates for many grouping sets in one pass.
+
+The prevalence and incidence tutorials each reload the depression CSV and run
+their own ``groupby('Year')`` and ``groupby('Region')`` means. ``summarize``
+takes the cases/population frame once, aggregates it at the finest grouping
+needed and rolls every requested grouping set up from that single aggregate.
+Crude means and population-weighted rates come out of the same sums;
+missing values are left out of both.
+"""
+import pandas as pd
+
+from epi.incidence import CASES, CHANGE, POPULATION, RATE, incidence_rate, lag_change
+
+PREVALENCE = 'Prevalence (%)'
+
+DEFAULT_GROUPING_SETS = (('Year',), ('Region',), ('Year', 'Region'))
+
+# Row-level rate columns and the multiplier each one uses
+ROW_RATES = {
+    PREVALENCE: 100,
+    RATE: 1000,
+}
+
+# Cases and population of the rows where both are present (weighted rates)
+POOLED_CASES = 'pooled cases'
+POOLED_POPULATION = 'pooled population'
+
+
+def prepare(data, cases=CASES, population=POPULATION, change_by='Region', change_order='Year'):
+    """Cast counts to float once and add the row-level rate and YoY change columns."""
+    data = data.copy()
+    data[population] = data[population].astype(float)
+    data[cases] = data[cases].astype(float)
+    for column, per in ROW_RATES.items():
+        data[column] = incidence_rate(data[cases], data[population], per=per)
+    if change_by is not None:
+        data[CHANGE] = lag_change(data, RATE, by=change_by, order=change_order)
+    return data
+
+
+def additive_terms(data, value_columns, cases=CASES, population=POPULATION):
+    """Row-level terms whose per-group sums ``finalize`` turns into rates.
+
+    Every value column keeps its values (NaN is skipped when summed) and
+    gets a non-null count ``n <column>``, so a missing value counts in
+    neither the numerator nor the denominator of its crude mean. The pooled
+    cases and population only include rows where both are present. ``n``
+    counts every row.
+    """
+    terms = data[value_columns].copy()
+    for column in value_columns:
+        terms[f'n {column}'] = data[column].notna().astype(int)
+    complete = data[cases].notna() & data[population].notna()
+    terms[POOLED_CASES] = data[cases].where(complete, 0)
+    terms[POOLED_POPULATION] = data[population].where(complete, 0)
+    terms['n'] = 1
+    return terms
+
+
+def finalize(sums, cases=CASES, population=POPULATION):
+    """Rates from per-group sums of ``additive_terms``.
+
+    Crude means are sums over non-null counts; weighted rates are pooled
+    cases over pooled population, so both come from the same additive sums.
+    """
+    result = pd.DataFrame(index=sums.index)
+    result[cases] = sums[cases]
+    result[population] = sums[population]
+    for column, per in ROW_RATES.items():
+        result[column] = sums[column] / sums[f'n {column}']
+        result[f'Weighted {column}'] = incidence_rate(sums[POOLED_CASES], sums[POOLED_POPULATION], per=per)
+    if CHANGE in sums:
+        result[CHANGE] = sums[CHANGE] / sums[f'n {CHANGE}']
+    result['n'] = sums['n']
+    return result.reset_index()
+
+
+def summarize(data, grouping_sets=DEFAULT_GROUPING_SETS, cases=CASES, population=POPULATION, prepared=False):
+    """Crude and population-weighted rates for every grouping set.
+
+    Returns a dict mapping each grouping set (a tuple of column names) to a
+    tidy DataFrame. The raw rows are scanned once; coarser grouping sets are
+    rolled up from the aggregate at the union of all grouping keys.
+    """
+    if not prepared:
+        data = prepare(data, cases=cases, population=population)
+    grouping_sets = [tuple(keys) for keys in grouping_sets]
+
+    finest = []
+    for keys in grouping_sets:
+        finest.extend(key for key in keys if key not in finest)
+
+    value_columns = [cases, population, *ROW_RATES]
+    if CHANGE in data:
+        value_columns.append(CHANGE)
+    terms = additive_terms(data, value_columns, cases=cases, population=population)
+    finest_sums = terms.groupby([data[key] for key in finest], sort=True, observed=True).sum()
+
+    results = {}
+    for keys in grouping_sets:
+        if list(keys) == finest:
+            sums = finest_sums
+        else:
+            sums = finest_sums.groupby(level=list(keys), sort=True).sum()
+        results[keys] = finalize(sums, cases, population)
+    return results
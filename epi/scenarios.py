@@ -0,0 +1,178 @@
+"""Run a SIR/SEIR parameter grid across a process pool, one shard per chunk.
+
+The grid is a CSV with one scenario per row: columns ``N``, ``beta``,
+``gamma`` (and ``sigma`` for SEIR), plus optional initial compartment
+columns (``S``, ``E``, ``I``, ``R``). Missing compartments start at 0, except
+``I`` which defaults to 1 and ``S`` which defaults to whatever is left of N.
+
+Each chunk of rows is solved with ``epi.compartmental.solve_batch`` in a
+worker process and written straight to ``<out_dir>/chunk-NNNNN.npz``, so
+no more than one chunk per worker is ever held in memory. Shards are
+written under a temporary name and renamed when complete, which makes a
+rerun skip every chunk that already finished. ``manifest.json`` records the
+grid's SHA-256, the model, method, times and chunk size; resuming into a
+directory written with different settings is refused unless
+``overwrite=True``, since its shards would not line up with the new chunks.
+
+Usage: python -m epi.scenarios grid.csv out_dir --model seir --days 50
+"""
+import argparse
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from epi.compartmental import MODELS, solve_batch
+from epi.data import file_hash
+
+
+def initial_state(grid, compartments):
+    """(rows, compartments) initial conditions from a parameter grid."""
+    N = grid['N'].to_numpy(dtype=float)
+    state = {}
+    for name in compartments:
+        if name in grid:
+            state[name] = grid[name].to_numpy(dtype=float)
+        elif name == 'I':
+            state[name] = np.ones(len(grid))
+        elif name != 'S':
+            state[name] = np.zeros(len(grid))
+    if 'S' not in state:
+        state['S'] = N - sum(state.values())
+    return np.column_stack([state[name] for name in compartments])
+
+
+def shard_path(out_dir, chunk):
+    return os.path.join(out_dir, f'chunk-{chunk:05d}.npz')
+
+
+def _manifest(grid_path, model, times, chunk_size, method):
+    return {
+        'grid_sha256': file_hash(grid_path),
+        'model': model,
+        'method': method,
+        'times': np.asarray(times, dtype=float).tolist(),
+        'chunk_size': int(chunk_size),
+    }
+
+
+def _prepare_out_dir(out_dir, manifest, overwrite):
+    # Check (or start) the run recorded in out_dir before any shard is reused
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, 'manifest.json')
+    shards = glob.glob(os.path.join(out_dir, 'chunk-*.npz'))
+    try:
+        with open(path) as handle:
+            existing = json.load(handle)
+    except (OSError, ValueError):
+        existing = None
+
+    if existing != manifest and (shards or existing is not None):
+        if not overwrite:
+            raise ValueError(f"{out_dir} holds shards from a run with a different grid, model, method, "
+                             f"times or chunk size; use another directory or overwrite=True")
+        for shard in shards:
+            os.remove(shard)
+    if existing != manifest:
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as handle:
+            json.dump(manifest, handle, indent=1)
+        os.replace(tmp_path, path)
+
+
+def run_chunk(model, chunk, rows, grid, times, out_dir, method='rk4'):
+    """Solve one chunk of the grid and write it to its shard. Returns the row count."""
+    rhs, compartments, param_names = MODELS[model]
+    y0 = initial_state(grid, compartments)
+    args = [grid[name].to_numpy(dtype=float) for name in param_names]
+    trajectory = solve_batch(rhs, y0, times, args, method=method)
+
+    path = shard_path(out_dir, chunk)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as handle:
+        np.savez(handle, rows=rows, times=times, trajectory=trajectory,
+                 compartments=np.array(compartments))
+    os.replace(tmp_path, path)
+    return len(rows)
+
+
+def run_grid(grid_path, out_dir, model='seir', times=None, chunk_size=10_000, workers=None, method='rk4',
+             overwrite=False):
+    """Solve every scenario in `grid_path`, skipping chunks already on disk.
+
+    Raises ValueError if `out_dir` was written by a run with other settings,
+    unless `overwrite` is set, in which case its shards are deleted first.
+
+    Returns a dict with the number of chunks run and skipped, scenarios
+    solved, elapsed seconds and throughput in scenarios per second.
+    """
+    if times is None:
+        times = np.arange(0, 51, 1)
+    times = np.asarray(times, dtype=float)
+    param_names = MODELS[model][2]
+
+    grid = pd.read_csv(grid_path)
+    missing = [name for name in param_names if name not in grid]
+    if missing:
+        raise ValueError(f"{grid_path} is missing parameter columns {missing}")
+    _prepare_out_dir(out_dir, _manifest(grid_path, model, times, chunk_size, method), overwrite)
+
+    n_chunks = -(-len(grid) // chunk_size)
+    pending = [chunk for chunk in range(n_chunks) if not os.path.exists(shard_path(out_dir, chunk))]
+
+    start = time.perf_counter()
+    solved = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for chunk in pending:
+            rows = np.arange(chunk * chunk_size, min((chunk + 1) * chunk_size, len(grid)))
+            futures.append(pool.submit(run_chunk, model, chunk, rows, grid.iloc[rows], times, out_dir, method))
+        for future in as_completed(futures):
+            solved += future.result()
+    elapsed = time.perf_counter() - start
+
+    return {
+        'chunks_run': len(pending),
+        'chunks_skipped': n_chunks - len(pending),
+        'scenarios': solved,
+        'seconds': elapsed,
+        'scenarios_per_second': solved / elapsed if elapsed > 0 else float('nan'),
+    }
+
+
+def load_shards(out_dir):
+    """Iterate over (rows, trajectory) pairs, one finished shard at a time."""
+    for name in sorted(os.listdir(out_dir)):
+        if name.startswith('chunk-') and name.endswith('.npz'):
+            with np.load(os.path.join(out_dir, name)) as shard:
+                yield shard['rows'], shard['trajectory']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run a SIR/SEIR parameter grid on a process pool.')
+    parser.add_argument('grid', help='CSV with one scenario per row')
+    parser.add_argument('out_dir', help='directory for chunk-NNNNN.npz shards')
+    parser.add_argument('--model', choices=sorted(MODELS), default='seir')
+    parser.add_argument('--days', type=int, default=50)
+    parser.add_argument('--chunk-size', type=int, default=10_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--overwrite', action='store_true',
+                        help='discard shards written with a different grid or settings')
+    args = parser.parse_args(argv)
+
+    try:
+        summary = run_grid(args.grid, args.out_dir, model=args.model, times=np.arange(0, args.days + 1, 1),
+                           chunk_size=args.chunk_size, workers=args.workers, overwrite=args.overwrite)
+    except ValueError as error:
+        parser.exit(1, f'{parser.prog}: {error}\n')
+    print(f"{summary['scenarios']} scenarios in {summary['chunks_run']} chunks "
+          f"({summary['chunks_skipped']} already done) in {summary['seconds']:.2f} s: "
+          f"{summary['scenarios_per_second']:.0f} scenarios/s")
+
+
+if __name__ == '__main__':
+    main()
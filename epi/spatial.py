@@ -0,0 +1,146 @@
+"""Assign point features to county (or tract) polygons with an STRtree.
+
+The Leaflet tutorial counts Trauma Level I hospitals with
+``groupby('COUNTYFIPS')`` and then merges the counts and the name lists onto
+the counties in two separate ``merge`` calls. That only works for feeds that
+carry a FIPS field. ``PolygonIndex`` locates each point in the polygons
+themselves: it builds a shapely STRtree over the polygons once, caches the
+polygons on disk next to the data cache, and assigns millions of points in
+one bulk query. ``aggregate`` then produces per-polygon counts and name
+lists in a single grouped step, already aligned with the polygon order.
+
+Usage::
+
+    index = PolygonIndex.from_file('.../cb_2018_us_county_500k.shp', id_column='GEOID')
+    summary = index.aggregate(hospitals.geometry, names=hospitals['NAME'])
+    counties['trauma_count'] = summary['count'].to_numpy()
+"""
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import shapely
+from shapely import STRtree
+
+from epi.choropleth import join_names
+from epi.data import cache_dir, open_entry, write_entry
+
+
+class PolygonIndex:
+    """Polygons, their ids and an STRtree over them."""
+
+    def __init__(self, geometries, ids, crs=None):
+        self.geometries = np.asarray(geometries, dtype=object)
+        self.ids = np.asarray(ids)
+        self.crs = crs
+        self.tree = STRtree(self.geometries)
+
+    @classmethod
+    def from_frame(cls, polygons, id_column='GEOID'):
+        """Index a GeoDataFrame of polygons."""
+        return cls(polygons.geometry.to_numpy(), polygons[id_column].to_numpy(), crs=polygons.crs)
+
+    @classmethod
+    def from_file(cls, path, id_column='GEOID', refresh=False):
+        """Index a polygon file, reusing the on-disk cache while the file is unchanged.
+
+        The cache stores the polygons as WKB, which loads far faster than
+        re-reading the shapefile; the STRtree itself is rebuilt on load,
+        which takes milliseconds for a few thousand counties. A shapefile's
+        ``.dbf``, ``.shx``, ``.prj`` and ``.cpg`` sidecars are part of the
+        fingerprint, since the ids and CRS come from them.
+        """
+        path = os.path.abspath(path)
+        entry = _cache_entry(path, id_column)
+        files = source_files(path)
+        directory, meta = (None, None) if refresh else open_entry(entry, files)
+        if directory is not None:
+            ids = np.load(os.path.join(directory, 'ids.npy'))
+            blob = np.load(os.path.join(directory, 'wkb.npy'))
+            offsets = np.load(os.path.join(directory, 'offsets.npy'))
+            wkb = [blob[start:end].tobytes() for start, end in zip(offsets[:-1], offsets[1:])]
+            return cls(shapely.from_wkb(wkb), ids, crs=meta['crs'])
+
+        import geopandas as gpd
+
+        polygons = gpd.read_file(path)
+        index = cls.from_frame(polygons, id_column=id_column)
+        write_entry(entry, files, lambda directory: _write_polygons(directory, index))
+        return index
+
+    def assign(self, points):
+        """Position of the polygon containing each point, or -1 if none does.
+
+        `points` is a GeoSeries, an array of shapely points or an (n, 2)
+        array of x/y coordinates in the polygons' CRS. A point on a shared
+        border is given to the first polygon the tree reports.
+        """
+        if hasattr(points, 'crs') and points.crs is not None and self.crs is not None:
+            points = points.to_crs(self.crs)
+        if hasattr(points, 'geometry'):
+            points = points.geometry.to_numpy()
+        points = np.asarray(points)
+        if points.dtype != object:
+            points = shapely.points(points)
+
+        point_positions, polygon_positions = self.tree.query(points, predicate='intersects')
+        assigned = np.full(len(points), -1, dtype=np.int64)
+        # Keep the first hit for each point
+        first = np.unique(point_positions, return_index=True)[1]
+        assigned[point_positions[first]] = polygon_positions[first]
+        return assigned
+
+    def aggregate(self, points, names=None, separator='<br>', empty_name='No hospitals'):
+        """Per-polygon point counts (and joined names) in polygon order.
+
+        Returns a DataFrame with one row per polygon: ``id``, ``count`` and,
+        when `names` is given, ``names`` joined with `separator`.
+        """
+        assigned = self.assign(points)
+        inside = assigned >= 0
+        summary = pd.DataFrame({
+            'id': self.ids,
+            'count': np.bincount(assigned[inside], minlength=len(self.ids)),
+        })
+        if names is not None:
+            joined = join_names(np.asarray(names)[inside], assigned[inside], separator=separator)
+            summary['names'] = joined.reindex(np.arange(len(self.ids))).fillna(empty_name).to_numpy()
+        return summary
+
+
+# Files read alongside a shapefile; missing ones are skipped
+SHAPEFILE_SIDECARS = ('.shx', '.dbf', '.prj', '.cpg')
+
+
+def source_files(path):
+    """`path` plus whichever shapefile sidecars exist next to it."""
+    stem, extension = os.path.splitext(path)
+    if extension.lower() != '.shp':
+        return [path]
+    files = [path]
+    for sidecar in SHAPEFILE_SIDECARS:
+        for candidate in (stem + sidecar, stem + sidecar.upper()):
+            if os.path.exists(candidate):
+                files.append(candidate)
+                break
+    return files
+
+
+def _cache_entry(path, id_column):
+    # One entry per source path and id column
+    key = hashlib.sha256(f'{path}\0{id_column}'.encode('utf-8')).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir(), f'polygons-{name}-{key}')
+
+
+def _write_polygons(directory, index):
+    # Plain .npy arrays plus the CRS as WKT; nothing here needs unpickling to load
+    wkb = shapely.to_wkb(index.geometries)
+    offsets = np.zeros(len(wkb) + 1, dtype=np.int64)
+    np.cumsum([len(item) for item in wkb], out=offsets[1:])
+    np.save(os.path.join(directory, 'wkb.npy'), np.frombuffer(b''.join(wkb), dtype=np.uint8))
+    np.save(os.path.join(directory, 'offsets.npy'), offsets)
+    ids = index.ids if index.ids.dtype != object else index.ids.astype(str)
+    np.save(os.path.join(directory, 'ids.npy'), ids)
+    return {'crs': None if index.crs is None else index.crs.to_wkt()}
@@ -0,0 +1,351 @@
+"""The tutorial analyses as callable stages, with real or synthetic inputs.
+
+The tutorial scripts do all their work at import time. Here every analysis
+is a function of one input object, so it can be timed, profiled or chained
+with others in one process:
+
+=============  =================  ==========================================
+stage          input              result
+=============  =================  ==========================================
+prevalence     depression         crude and weighted prevalence by Year and
+                                  by Region (dict of frames)
+incidence      depression         rows with incidence rate and YoY change
+odds-ratio     smoking_survey     2x2 table, odds ratio and Fisher p-value
+relative-risk  smoking_survey     2x2 table, risk ratio and 95% CI
+ttest          belfast_suicide    Welch t-tests for every pair of areas
+correlation    disease_distance   Pearson/Spearman per disease
+sir, seir      sir, seir          trajectories for a batch of scenarios
+map            counties           bytes written per exported map file
+=============  =================  ==========================================
+
+``BASELINE_STAGES`` holds the tutorials' own implementations of the hot
+paths (the incidence loop, the per-row ``.apply`` classification, the
+per-disease filtering) so the harness can time them against the stages.
+
+``load_input`` returns the real input (tutorial CSVs through the shared
+``epi.data.cached`` frames, the tutorial ODE parameters, the county
+shapefile plus ``Hospitals.geojson``); ``synthetic_input`` generates an
+input of the same shape at any `scale`, where scale 1 is roughly the size
+of the tutorial data. numpy, pandas and the analysis modules are imported
+inside the functions, so importing this module (e.g. to list the stages)
+costs almost nothing.
+"""
+import os
+
+SMOKING_CODES = ('C34.90', 'C96.29')
+
+COUNTIES = 'LeafletMapPython/Data/CountyShapefiles/cb_2018_us_county_500k.shp'
+HOSPITALS = 'LeafletMapPython/Data/Hospitals.geojson'
+
+# The tutorials' single ODE scenario
+TUTORIAL_SCENARIOS = {
+    'sir': {'y0': [999, 1, 0], 'N': 1000, 'beta': 0.3, 'gamma': 0.1},
+    'seir': {'y0': [999, 0, 1, 0], 'N': 1000, 'beta': 0.5, 'gamma': 0.1, 'sigma': 1 / 5},
+}
+
+
+def prevalence(data):
+    from epi.rates import prepare, summarize
+
+    return summarize(prepare(data, change_by=None), grouping_sets=(('Year',), ('Region',)), prepared=True)
+
+
+def incidence(data):
+    from epi.incidence import add_incidence_columns
+
+    # add_incidence_columns writes into its argument; the real input is the
+    # epi.data.cached frame shared by every stage and repeat
+    return add_incidence_columns(data.copy())
+
+
+def _smoking_table(survey):
+    from epi.contingency import TOTAL, count_chunk
+
+    return count_chunk(survey, 'smoking_status', 'smoker', 'non-smoker', 'diagnosis_codes', SMOKING_CODES)[TOTAL]
+
+
+def odds_ratio(survey):
+    from epi.contingency import odds_ratio as fisher_odds_ratio
+
+    table = _smoking_table(survey)
+    ratio, p_value = fisher_odds_ratio(table)
+    return {'table': table, 'odds_ratio': ratio, 'p': p_value}
+
+
+def relative_risk(survey):
+    from epi.contingency import relative_risk as risk_ratio
+
+    table = _smoking_table(survey)
+    ratio, lower, upper = risk_ratio(table)
+    return {'table': table, 'relative_risk': ratio, 'lower': lower, 'upper': upper}
+
+
+def ttest(frame):
+    from epi.ttest import to_wide, welch_ttests
+
+    return welch_ttests(to_wide(frame))
+
+
+def correlation(frame):
+    from epi.correlation import correlations, count_matrix
+
+    return correlations(count_matrix(frame))
+
+
+def _solve(model, scenarios):
+    import numpy as np
+
+    from epi.compartmental import solve_model
+
+    scenarios = dict(scenarios)
+    y0 = np.atleast_2d(np.asarray(scenarios.pop('y0'), dtype=float))
+    times = scenarios.pop('times', np.arange(0, 51, 1))
+    return solve_model(model, y0, times, **scenarios)
+
+
+def sir(scenarios):
+    return _solve('sir', scenarios)
+
+
+def seir(scenarios):
+    return _solve('seir', scenarios)
+
+
+def county_map(inputs, out_dir=None):
+    """Trauma Level I choropleth: count hospitals per county and export the map.
+
+    `inputs` holds ``counties`` (a GeoDataFrame with GEOID) and
+    ``hospitals`` (Level I points with NAME). Without `out_dir` the map is
+    written to a temporary directory that is removed afterwards.
+    """
+    import tempfile
+
+    from epi.choropleth import TRAUMA_BINS, tooltip_html
+    from epi.mapexport import export_map
+    from epi.spatial import PolygonIndex
+
+    counties = inputs['counties']
+    hospitals = inputs['hospitals']
+    summary = PolygonIndex.from_frame(counties).aggregate(hospitals.geometry, names=hospitals['NAME'])
+    colors, opacity = TRAUMA_BINS.fill(summary['count'])
+    tooltips = tooltip_html(summary, {'Name of Trauma Level I Hospitals': 'names'}, escape=False)
+    legend = TRAUMA_BINS.legend_html('Number of Trauma Level I Facilities by County')
+    if out_dir is not None:
+        return export_map(counties, out_dir, colors, opacity, tooltips, legend_html=legend)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        return export_map(counties, tmp_dir, colors, opacity, tooltips, legend_html=legend)
+
+
+# Stage name -> (input name, function)
+STAGES = {
+    'prevalence': ('depression', prevalence),
+    'incidence': ('depression', incidence),
+    'odds-ratio': ('smoking_survey', odds_ratio),
+    'relative-risk': ('smoking_survey', relative_risk),
+    'ttest': ('belfast_suicide', ttest),
+    'correlation': ('disease_distance', correlation),
+    'sir': ('sir', sir),
+    'seir': ('seir', seir),
+    'map': ('counties', county_map),
+}
+
+
+def incidence_loop(data):
+    """Tutorial baseline: Step 2 rate and the Step 3 per-region loop."""
+    from epi.benchmarks.incidence import loop_change
+    from epi.incidence import CASES, POPULATION, RATE, incidence_rate
+
+    data = data.copy()
+    data[RATE] = incidence_rate(data[CASES], data[POPULATION])
+    return loop_change(data)
+
+
+def odds_ratio_apply(survey):
+    """Tutorial baseline: per-row ``.apply`` classification, crosstab and Fisher's test.
+
+    Kept as the tutorial wrote it, substring match included.
+    """
+    import pandas as pd
+    from scipy.stats import fisher_exact
+
+    def has_lung_cancer(codes):
+        if SMOKING_CODES[0] in codes or SMOKING_CODES[1] in codes:
+            return 'yes'
+        else:
+            return 'no'
+
+    survey = survey[['smoking_status', 'diagnosis_codes']].astype({'diagnosis_codes': str})
+    lung_cancer = pd.Categorical(survey['diagnosis_codes'].apply(has_lung_cancer), categories=['yes', 'no'])
+    smoking_status = pd.Categorical(survey['smoking_status'], categories=['smoker', 'non-smoker'])
+    table = pd.crosstab(smoking_status, lung_cancer)
+    ratio, p_value = fisher_exact(table, alternative='two-sided')
+    return {'table': table.to_numpy(), 'odds_ratio': float(ratio), 'p': float(p_value)}
+
+
+def correlation_filter(frame):
+    """Tutorial baseline: filter, group and ``np.corrcoef`` once per disease."""
+    import numpy as np
+    import pandas as pd
+
+    results = {}
+    for disease in pd.unique(frame['Disease']):
+        grouped = frame[frame['Disease'] == disease].groupby('Distance from Well A').size().reset_index(name='count_A')
+        results[disease] = np.corrcoef(grouped['Distance from Well A'], grouped['count_A'])[0, 1]
+    return results
+
+
+# The tutorial implementations of the hot paths, for comparison with STAGES;
+# same (input name, function) layout
+BASELINE_STAGES = {
+    'incidence-loop': ('depression', incidence_loop),
+    'odds-ratio-apply': ('smoking_survey', odds_ratio_apply),
+    'correlation-filter': ('disease_distance', correlation_filter),
+}
+
+
+def load_input(name):
+    """The real input for a stage: a shared cached frame, ODE parameters or map layers."""
+    if name in TUTORIAL_SCENARIOS:
+        return dict(TUTORIAL_SCENARIOS[name])
+
+    from epi.data import DATASETS, ROOT, cached
+
+    if name in DATASETS:
+        return cached(name)
+    if name == 'counties':
+        # Hospitals.geojson is downloaded separately, as in the map tutorial
+        paths = [os.path.join(ROOT, path) for path in (COUNTIES, HOSPITALS)]
+        for path in paths:
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"{path} not found")
+
+        import geopandas as gpd
+
+        hospitals = gpd.read_file(paths[1])
+        return {
+            'counties': gpd.read_file(paths[0]),
+            'hospitals': hospitals[hospitals['TRAUMA'] == 'LEVEL I'],
+        }
+    raise KeyError(f"unknown input {name!r}")
+
+
+def _synthetic_depression(scale, rng):
+    import numpy as np
+    import pandas as pd
+
+    regions = np.array([f'Region {i}' for i in range(max(1, int(8 * scale)))])
+    years = np.arange(2010, 2022)
+    population = rng.integers(500_000, 2_000_000, (len(regions), 1)) * np.ones((1, len(years)), dtype=np.int64)
+    return pd.DataFrame({
+        'Year': np.tile(years, len(regions)),
+        'Region': np.repeat(regions, len(years)),
+        'Total Population': population.ravel(),
+        'Diagnosed Depression Cases by Region Year': rng.binomial(population.ravel(), 0.015),
+    })
+
+
+def _synthetic_smoking(scale, rng):
+    import numpy as np
+    import pandas as pd
+
+    n = max(1, int(3500 * scale))
+    smoker = rng.random(n) < 0.5
+    codes = np.array(['K21.9', 'I10', 'B07.9', 'E11.9', 'J06.9', 'R05', 'C34.901'])
+    extra = codes[rng.integers(0, len(codes), n)]
+    cancer = rng.random(n) < np.where(smoker, 0.4, 0.1)
+    cancer_code = np.array(SMOKING_CODES)[rng.integers(0, 2, n)]
+    return pd.DataFrame({
+        'smoking_status': np.where(smoker, 'smoker', 'non-smoker'),
+        'age': rng.integers(18, 90, n),
+        'diagnosis_codes': np.where(cancer, np.char.add(np.char.add(extra, ';'), cancer_code), extra),
+        'zipcodes': rng.integers(10001, 10099, n),
+    })
+
+
+def _synthetic_belfast(scale, rng):
+    import numpy as np
+    import pandas as pd
+
+    areas = max(2, int(10 * scale))
+    years = [str(year) for year in range(1997, 2019)]
+    counts = rng.poisson(rng.uniform(5, 40, (areas, 1)), (areas, len(years)))
+    frame = pd.DataFrame(counts, columns=years)
+    frame.insert(0, 'Assembly Area', [f'Area {i}' for i in range(areas)])
+    return frame
+
+
+def _synthetic_disease(scale, rng):
+    import numpy as np
+    import pandas as pd
+
+    n = max(1, int(300 * scale))
+    diseases = np.array(['Cholera', 'Influenza', 'No Enteric Diseases'])
+    disease = diseases[rng.integers(0, len(diseases), n)]
+    # Cholera clusters near the well, the others are spread out
+    distance = np.where(disease == 'Cholera', rng.exponential(8, n), rng.uniform(0, 40, n))
+    return pd.DataFrame({'Disease': disease, 'Distance from Well A': np.round(distance).astype(int)})
+
+
+def _synthetic_scenarios(model, scale, rng):
+    import numpy as np
+
+    size = max(1, int(100 * scale))
+    infected = rng.integers(1, 10, size).astype(float)
+    scenarios = {
+        'N': np.full(size, 1000.0),
+        'beta': rng.uniform(0.2, 0.6, size),
+        'gamma': rng.uniform(0.05, 0.2, size),
+    }
+    if model == 'seir':
+        scenarios['sigma'] = rng.uniform(1 / 7, 1 / 3, size)
+        scenarios['y0'] = np.column_stack([1000 - infected, np.zeros(size), infected, np.zeros(size)])
+    else:
+        scenarios['y0'] = np.column_stack([1000 - infected, infected, np.zeros(size)])
+    return scenarios
+
+
+def _synthetic_counties(scale, rng):
+    import geopandas as gpd
+    import numpy as np
+    import shapely
+
+    # A grid of square "counties" over the continental US, points scattered over it
+    side = max(1, int(round(np.sqrt(1000 * scale))))
+    x0, y0, width, height = -125.0, 25.0, 58.0, 24.0
+    xs = x0 + width * np.arange(side) / side
+    ys = y0 + height * np.arange(side) / side
+    x, y = (grid.ravel() for grid in np.meshgrid(xs, ys))
+    counties = gpd.GeoDataFrame({
+        'GEOID': [f'{i:05d}' for i in range(side * side)],
+    }, geometry=shapely.box(x, y, x + width / side, y + height / side), crs='EPSG:4326')
+
+    n = max(1, int(500 * scale))
+    points = shapely.points(x0 + width * rng.random(n), y0 + height * rng.random(n))
+    hospitals = gpd.GeoDataFrame({'NAME': [f'Hospital {i}' for i in range(n)]}, geometry=points, crs='EPSG:4326')
+    return {'counties': counties, 'hospitals': hospitals}
+
+
+SYNTHETIC = {
+    'depression': _synthetic_depression,
+    'smoking_survey': _synthetic_smoking,
+    'belfast_suicide': _synthetic_belfast,
+    'disease_distance': _synthetic_disease,
+    'sir': lambda scale, rng: _synthetic_scenarios('sir', scale, rng),
+    'seir': lambda scale, rng: _synthetic_scenarios('seir', scale, rng),
+    'counties': _synthetic_counties,
+}
+
+
+def synthetic_input(name, scale=1, seed=0):
+    """A synthetic input shaped like the real one, about `scale` times its size."""
+    import numpy as np
+
+    return SYNTHETIC[name](scale, np.random.default_rng(seed))
+
+
+def run(stage, data=None, **options):
+    """Run one stage on `data`, loading its real input when None."""
+    input_name, function = STAGES[stage]
+    if data is None:
+        data = load_input(input_name)
+    return function(data, **options)
@@ -0,0 +1,128 @@
+"""Stochastic SIR/SEIR realizations with replicates held as NumPy arrays.
+
+Uses the same compartments and parameters as ``epi.compartmental``. Two
+methods are available:
+
+* ``'gillespie'``: exact stochastic simulation. Every replicate keeps its own
+  clock and pending event; each loop iteration fires the next event of every
+  replicate that is still behind the current output time.
+* ``'tau'``: tau-leaping. All replicates advance together in steps of
+  length `tau`, drawing Poisson event counts per transition.
+
+``simulate`` is a generator that yields one quantile summary per output
+time, so memory depends on the number of replicates and compartments but
+not on the length of the horizon.
+"""
+import numpy as np
+
+from epi.compartmental import MODELS
+
+# Transitions as (source compartment, target compartment) indices
+TRANSITIONS = {
+    'sir': ((0, 1), (1, 2)),
+    'seir': ((0, 1), (1, 2), (2, 3)),
+}
+
+
+def stoichiometry(model):
+    """(transitions, compartments) matrix of state changes for each transition."""
+    n_compartments = len(MODELS[model][1])
+    change = np.zeros((len(TRANSITIONS[model]), n_compartments), dtype=np.int64)
+    for row, (source, target) in enumerate(TRANSITIONS[model]):
+        change[row, source] = -1
+        change[row, target] = 1
+    return change
+
+
+def propensities(model, x, N, beta, gamma, sigma=None):
+    """(replicates, transitions) event rates for states `x` of shape (replicates, compartments)."""
+    if model == 'sir':
+        S, I = x[:, 0], x[:, 1]
+        return np.column_stack([beta * S * I / N, gamma * I])
+    S, E, I = x[:, 0], x[:, 1], x[:, 2]
+    return np.column_stack([beta * S * I / N, sigma * E, gamma * I])
+
+
+def _draw_events(model, x, params, rng):
+    # Waiting time and transition index of the next event for each row of x;
+    # replicates with no possible events wait forever
+    rates = propensities(model, x, **params)
+    total = rates.sum(axis=1)
+    with np.errstate(divide='ignore'):
+        wait = -np.log(1.0 - rng.random(len(x))) / total
+    threshold = rng.random(len(x)) * total
+    choice = (np.cumsum(rates, axis=1) <= threshold[:, None]).sum(axis=1)
+    return wait, np.minimum(choice, rates.shape[1] - 1)
+
+
+def _gillespie(model, x, times, params, rng):
+    change = stoichiometry(model)
+    clock = np.full(len(x), times[0])
+    wait, choice = _draw_events(model, x, params, rng)
+    next_time = clock + wait
+    yield x
+    for target in times[1:]:
+        due = np.flatnonzero(next_time <= target)
+        while len(due):
+            x[due] += change[choice[due]]
+            clock[due] = next_time[due]
+            wait, choice[due] = _draw_events(model, x[due], params, rng)
+            next_time[due] = clock[due] + wait
+            due = due[next_time[due] <= target]
+        yield x
+
+
+def _tau_leap(model, x, times, params, rng, tau):
+    change = stoichiometry(model)
+    sources = np.array([source for source, _ in TRANSITIONS[model]])
+    yield x
+    for start, end in zip(times[:-1], times[1:]):
+        n_steps = max(1, int(np.ceil((end - start) / tau)))
+        step = (end - start) / n_steps
+        for _ in range(n_steps):
+            events = rng.poisson(propensities(model, x, **params) * step)
+            # A compartment cannot lose more individuals than it holds
+            events = np.minimum(events, x[:, sources])
+            x += events @ change
+        yield x
+
+
+def simulate(model, y0, times, replicates=1000, method='tau', tau=0.1,
+             quantiles=(0.05, 0.5, 0.95), seed=None, **params):
+    """Yield ``(time, quantiles, mean)`` for each output time.
+
+    `quantiles` has shape (len(quantiles), compartments) and `mean` has
+    shape (compartments,). Parameters are passed by name as in
+    ``epi.compartmental.solve_model``.
+    """
+    param_names = MODELS[model][2]
+    missing = [name for name in param_names if name not in params]
+    if missing:
+        raise ValueError(f"{model} model needs parameters {missing}")
+    params = {name: float(params[name]) for name in param_names}
+
+    rng = np.random.default_rng(seed)
+    times = np.asarray(times, dtype=float)
+    x = np.tile(np.asarray(y0, dtype=np.int64), (replicates, 1))
+
+    if method == 'gillespie':
+        states = _gillespie(model, x, times, params, rng)
+    elif method == 'tau':
+        states = _tau_leap(model, x, times, params, rng, tau)
+    else:
+        raise ValueError(f"unknown stochastic method {method!r}; use 'gillespie' or 'tau'")
+
+    for time, state in zip(times, states):
+        yield time, np.quantile(state, quantiles, axis=0), state.mean(axis=0)
+
+
+def summarize(model, y0, times, replicates=1000, method='tau', tau=0.1,
+              quantiles=(0.05, 0.5, 0.95), seed=None, **params):
+    """Collect ``simulate`` into arrays: times, quantiles (times, q, compartments) and mean."""
+    rows = list(simulate(model, y0, times, replicates=replicates, method=method, tau=tau,
+                         quantiles=quantiles, seed=seed, **params))
+    return {
+        'times': np.array([row[0] for row in rows]),
+        'quantiles': np.stack([row[1] for row in rows]),
+        'mean': np.stack([row[2] for row in rows]),
+    }
@@ -0,0 +1,170 @@
+"""Incremental prevalence/incidence surveillance for appended Year x Region rows.
+
+The depression tutorials recompute everything from a static CSV. A
+``SurveillanceState`` keeps running sums per group (cases, population, row
+rates, YoY change and their non-null counts) for every grouping set, plus the last
+year and incidence rate seen for each region. Appending a batch costs
+O(new rows): the batch's change in incidence rate is taken against the
+stored last rate of each region, and the batch's group sums are added to
+the running ones.
+
+State lives in a directory: ``state.json`` holds the sums and last rates
+as plain column lists (no pickle, so opening a state never runs code from
+the file) and ``rows.csv`` is an append-only log of every row received. A
+batch that revises old rows (a region/year at or before the region's last
+year, or the same region/year twice in one batch) is merged into the log
+and the state is rebuilt from it; that is the only case that needs a full
+recompute.
+
+Usage::
+
+    state = SurveillanceState.open('surveillance_state')
+    state.update(new_rows)
+    tables = state.summary()
+"""
+import json
+import os
+
+import pandas as pd
+
+from epi.incidence import CASES, CHANGE, POPULATION, RATE, lag_change
+from epi.rates import DEFAULT_GROUPING_SETS, ROW_RATES, additive_terms, finalize, prepare
+
+
+class SurveillanceState:
+    """Running group sums and last rate per region, persisted in `directory`."""
+
+    def __init__(self, directory, grouping_sets=DEFAULT_GROUPING_SETS, by='Region', order='Year'):
+        self.directory = directory
+        self.grouping_sets = [tuple(keys) for keys in grouping_sets]
+        self.by = by
+        self.order = order
+        self.sums = {}
+        # Last `order` value and incidence rate of every region
+        self.last = pd.DataFrame(columns=[order, RATE], index=pd.Index([], name=by))
+        self.rows = 0
+
+    @property
+    def state_path(self):
+        return os.path.join(self.directory, 'state.json')
+
+    @property
+    def log_path(self):
+        return os.path.join(self.directory, 'rows.csv')
+
+    @classmethod
+    def open(cls, directory, **options):
+        """Load the state saved in `directory`, or start an empty one there.
+
+        A directory with a row log but no ``state.json`` (e.g. one written
+        by an older version) is rebuilt from the log.
+        """
+        path = os.path.join(directory, 'state.json')
+        if os.path.exists(path):
+            with open(path) as handle:
+                saved = json.load(handle)
+            state = cls(directory, grouping_sets=saved['grouping_sets'], by=saved['by'], order=saved['order'])
+            for item in saved['sums']:
+                keys = tuple(item['keys'])
+                state.sums[keys] = pd.DataFrame(item['columns']).set_index(list(keys))
+            if saved['last'][saved['by']]:
+                state.last = pd.DataFrame(saved['last']).set_index(saved['by'])
+            state.rows = saved['rows']
+            return state
+        os.makedirs(directory, exist_ok=True)
+        state = cls(directory, **options)
+        if os.path.exists(state.log_path):
+            state.rebuild()
+        return state
+
+    def save(self):
+        def columns(frame):
+            frame = frame.reset_index()
+            return {str(name): frame[name].tolist() for name in frame.columns}
+
+        saved = {
+            'grouping_sets': [list(keys) for keys in self.grouping_sets],
+            'by': self.by,
+            'order': self.order,
+            'rows': self.rows,
+            'sums': [{'keys': list(keys), 'columns': columns(sums)} for keys, sums in self.sums.items()],
+            'last': columns(self.last),
+        }
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w') as handle:
+            json.dump(saved, handle)
+        os.replace(tmp_path, self.state_path)
+
+    def _is_revision(self, batch):
+        keys = batch[[self.by, self.order]]
+        if keys.duplicated().any():
+            return True
+        last = batch[self.by].map(self.last[self.order])
+        return bool((last.notna() & (batch[self.order] <= last)).any())
+
+    def _accumulate(self, prepared):
+        terms = additive_terms(prepared, [CASES, POPULATION, *ROW_RATES, CHANGE])
+        for keys in self.grouping_sets:
+            sums = terms.groupby([prepared[key] for key in keys], observed=True).sum()
+            previous = self.sums.get(keys)
+            self.sums[keys] = sums if previous is None else previous.add(sums, fill_value=0)
+
+    def _append(self, batch):
+        prepared = prepare(batch, change_by=None)
+        # Change within the batch, then fix each region's first batch row to
+        # difference against the stored last rate instead of defaulting to 0
+        prepared[CHANGE] = lag_change(prepared, RATE, by=self.by, order=self.order)
+        first = prepared.groupby(self.by, observed=True)[self.order].transform('min') == prepared[self.order]
+        previous_rate = prepared[self.by].map(self.last[RATE]).astype(float)
+        # A region seen before differences against its stored rate even when
+        # that rate is missing (the change is then missing too, as in summarize)
+        carry = first & prepared[self.by].isin(self.last.index).to_numpy()
+        prepared.loc[carry, CHANGE] = prepared.loc[carry, RATE] - previous_rate[carry]
+
+        self._accumulate(prepared)
+        latest = prepared.sort_values(self.order).groupby(self.by, observed=True).tail(1)
+        latest = latest.set_index(self.by)[[self.order, RATE]]
+        self.last = pd.concat([self.last[~self.last.index.isin(latest.index)], latest])
+        self.rows += len(prepared)
+
+    def update(self, batch):
+        """Add a batch of rows and persist the new state.
+
+        Returns True when the batch revised old rows and the state was
+        rebuilt from the log, False for a plain O(batch) append. A
+        region/year that appears more than once (in the log or the batch,
+        including the very first batch) keeps its last copy.
+        """
+        batch = batch.reset_index(drop=True)
+        if self._is_revision(batch):
+            log = pd.read_csv(self.log_path) if os.path.exists(self.log_path) else batch.iloc[0:0]
+            replaced = log.set_index([self.by, self.order]).index.isin(
+                batch.set_index([self.by, self.order]).index)
+            merged = pd.concat([log[~replaced], batch], ignore_index=True)
+            merged = merged.drop_duplicates([self.by, self.order], keep='last')
+            merged.to_csv(self.log_path, index=False)
+            self.rebuild(merged)
+            return True
+
+        batch.to_csv(self.log_path, mode='a', header=not os.path.exists(self.log_path), index=False)
+        self._append(batch)
+        self.save()
+        return False
+
+    def rebuild(self, data=None):
+        """Recompute the state from `data` (the row log when None)."""
+        if data is None:
+            data = pd.read_csv(self.log_path)
+        self.sums = {}
+        self.last = self.last.iloc[0:0]
+        self.rows = 0
+        self._append(data.reset_index(drop=True))
+        self.save()
+
+    def summary(self):
+        """Rates for every grouping set, in the same layout as ``epi.rates.summarize``."""
+        return {keys: finalize(sums.sort_index()) for keys, sums in self.sums.items()}
+
+    def changes(self):
+        """Last year and incidence rate currently held for each region."""
+        return self.last.copy()
@@ -0,0 +1,12 @@
+import pytest
+
+from epi import data
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    """Keep every test's data cache under its own tmp_path, out of the repository."""
+    directory = tmp_path / 'epi_cache'
+    monkeypatch.setenv('EPI_CACHE_DIR', str(directory))
+    monkeypatch.setattr(data, '_loaded', {})
+    return directory
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from statsmodels.stats.contingency_tables import StratifiedTable
+
+from epi.association import analyze, mantel_haenszel_or, mantel_haenszel_rr
+from epi.contingency import cell_counts
+
+
+def _sample(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    strata = rng.choice(['18-39', '40-59', '60+'], n)
+    exposed = rng.random(n) < 0.4
+    has_outcome = rng.random(n) < np.where(exposed, 0.3, 0.1) + (strata == '60+') * 0.1
+    return exposed, has_outcome, strata
+
+
+def test_mantel_haenszel_matches_statsmodels():
+    _, tables = cell_counts(*_sample())
+    reference = StratifiedTable(np.moveaxis(tables, 0, -1).astype(float))
+    assert mantel_haenszel_or(tables) == pytest.approx(reference.oddsratio_pooled)
+    assert mantel_haenszel_rr(tables) == pytest.approx(reference.riskratio_pooled)
+
+
+def test_analyze_is_reproducible():
+    exposed, has_outcome, strata = _sample()
+    first = analyze(exposed, has_outcome, strata, n_resamples=500, seed=3)
+    second = analyze(exposed, has_outcome, strata, n_resamples=500, seed=3, workers=2)
+    assert first['stratum'].tolist() == ['18-39', '40-59', '60+', 'Mantel-Haenszel']
+    np.testing.assert_allclose(first.drop(columns='stratum'), second.drop(columns='stratum'))
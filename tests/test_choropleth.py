@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from epi.choropleth import TRAUMA_BINS, ColorBins, add_colors, join_names, tooltip_html
+
+
+def get_color(trauma_count):
+    # The tutorial's ladder
+    if trauma_count == 0:
+        return '#ffffff00'
+    elif trauma_count == 1:
+        return '#ffffb2'
+    elif trauma_count == 2:
+        return '#fecc5c'
+    elif trauma_count <= 4:
+        return '#fd8d3c'
+    elif trauma_count <= 6:
+        return '#f03b20'
+    elif trauma_count <= 12:
+        return '#bd0026'
+    else:
+        return '#800026'
+
+
+def test_trauma_bins_match_tutorial_ladder():
+    counts = np.arange(0, 20)
+    frame = add_colors(pd.DataFrame({'trauma_count': counts}), 'trauma_count')
+    assert frame['fill_color'].tolist() == [get_color(count) for count in counts]
+    assert frame['fill_opacity'].tolist() == [0.0] + [0.7] * (len(counts) - 1)
+
+
+def test_legend_lists_every_class():
+    legend = TRAUMA_BINS.legend_html('Trauma Level I Facilities')
+    for color, label in zip(TRAUMA_BINS.colors, TRAUMA_BINS.labels):
+        assert f'background: {color};' in legend and label in legend
+    assert ColorBins((0, 1, 2, 4), ['a', 'b', 'c', 'd', 'e']).labels == ['0', '1', '2', '3 - 4', '5+']
+    with pytest.raises(ValueError, match='need 5 colors'):
+        ColorBins((0, 1, 2, 4), ['a', 'b'])
+
+
+def test_tooltip_html_escapes_and_fills_missing():
+    frame = pd.DataFrame({'NAME': ['A & B <Clinic>', None], 'CITY': ['Reno', 'Elko'], 'STATE': ['NV', 'NV']})
+    tooltips = tooltip_html(frame, {'Name': 'NAME', 'City, State': ['CITY', 'STATE'], 'Beds': 'BEDS'})
+    assert tooltips.tolist() == [
+        '<b>Name:</b> A &amp; B &lt;Clinic&gt;<br><b>City, State:</b> Reno, NV<br><b>Beds:</b> N/A',
+        '<b>Name:</b> N/A<br><b>City, State:</b> Elko, NV<br><b>Beds:</b> N/A',
+    ]
+
+
+def test_join_names_keeps_order_within_groups():
+    joined = join_names(['x', 'y', 'z', 'w'], ['06001', '06003', '06001', '06001'])
+    assert joined.to_dict() == {'06001': 'x<br>z<br>w', '06003': 'y'}
@@ -0,0 +1,37 @@
+import pytest
+
+from epi import cli, stages
+
+
+@pytest.fixture
+def no_map_inputs(tmp_path, monkeypatch):
+    monkeypatch.setattr(stages, 'COUNTIES', str(tmp_path / 'missing.shp'))
+
+
+def test_single_stage_prints_result(capsys):
+    cli.main(['odds-ratio'])
+    out = capsys.readouterr().out
+    assert 'Odds Ratio:' in out and '==' not in out
+
+
+def test_all_skips_stages_with_missing_inputs(capsys, no_map_inputs):
+    cli.main(['all', '--timing'])
+    captured = capsys.readouterr()
+    ran = [line[3:] for line in captured.out.splitlines() if line.startswith('== ')]
+    assert ran == [stage for stage in stages.STAGES if stage != 'map']
+    assert "skipped map: cannot load input 'counties'" in captured.err
+    assert 'seir: ' in captured.err
+
+
+def test_named_stage_with_missing_input_fails(capsys, no_map_inputs):
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main(['sir', 'map'])
+    assert exit_info.value.code == 1
+    assert "map: cannot load input 'counties'" in capsys.readouterr().err
+
+
+def test_synthetic_all_runs_every_stage(capsys, tmp_path):
+    cli.main(['all', '--synthetic', '0.05', '--map-dir', str(tmp_path / 'map')])
+    ran = [line[3:] for line in capsys.readouterr().out.splitlines() if line.startswith('== ')]
+    assert ran == list(stages.STAGES)
+    assert (tmp_path / 'map' / 'index.html').exists()
@@ -0,0 +1,27 @@
+import numpy as np
+from scipy.integrate import odeint
+
+from epi.compartmental import seir_model, sir_model, solve_model
+
+
+def test_batched_solver_matches_odeint():
+    times = np.arange(0, 51, 1)
+    beta = np.array([0.3, 0.5])
+    sir = solve_model('sir', [[999, 1, 0]] * 2, times, N=1000, beta=beta, gamma=0.1)
+    seir = solve_model('seir', [[999, 0, 1, 0]] * 2, times, N=1000, beta=beta, gamma=0.1, sigma=0.2)
+    for i, b in enumerate(beta):
+        np.testing.assert_allclose(sir[i], odeint(sir_model, [999, 1, 0], times, args=(1000, b, 0.1)),
+                                   atol=1e-3)
+        np.testing.assert_allclose(seir[i], odeint(seir_model, [999, 0, 1, 0], times, args=(1000, b, 0.1, 0.2)),
+                                   atol=1e-3)
+
+
+def test_rk4_and_adaptive_layouts_agree():
+    times = np.linspace(0, 40, 21)
+    params = {'N': 1000, 'beta': np.array([0.3, 0.4, 0.6]), 'gamma': 0.1, 'sigma': 0.2}
+    y0 = [[990, 5, 5, 0]] * 3
+    rk4 = solve_model('seir', y0, times, **params)
+    adaptive = solve_model('seir', y0, times, method='DOP853', **params)
+    assert rk4.shape == adaptive.shape == (3, len(times), 4)
+    assert rk4.flags.c_contiguous and adaptive.flags.c_contiguous
+    np.testing.assert_allclose(rk4, adaptive, rtol=1e-3, atol=1e-2)
@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from epi.contingency import TOTAL, cell_counts, count_chunk, count_file
+from epi.data import load
+
+SURVEY = pd.DataFrame({
+    'smoking_status': ['smoker', 'non-smoker', None, 'former smoker'],
+    'diagnosis_codes': ['C34.90', 'I10', 'C34.90', 'C96.29'],
+})
+CODES = ('C34.90', 'C96.29')
+
+
+def test_count_chunk_drops_unknown_exposure():
+    # Missing and 'former smoker' rows are left out, as in the tutorial crosstab
+    table = count_chunk(SURVEY, 'smoking_status', 'smoker', 'non-smoker', 'diagnosis_codes', CODES)[TOTAL]
+    np.testing.assert_array_equal(table, [[1, 0], [0, 1]])
+
+
+def test_count_file_drops_unknown_exposure(tmp_path):
+    path = tmp_path / 'survey.csv'
+    pd.concat([SURVEY] * 5, ignore_index=True).to_csv(path, index=False)
+    expected = [[5, 0], [0, 5]]
+    np.testing.assert_array_equal(count_file(path, chunksize=3)[TOTAL], expected)
+    np.testing.assert_array_equal(count_file(path, workers=2)[TOTAL], expected)
+
+
+def test_cell_counts_skips_missing_strata():
+    exposed = np.array([True, True, False, False, True])
+    has_outcome = np.array([True, False, True, False, True])
+    strata = np.array(['40-49', np.nan, '40-49', '50-59', None], dtype=object)
+    labels, counts = cell_counts(exposed, has_outcome, strata)
+    assert labels.tolist() == ['40-49', '50-59']
+    np.testing.assert_array_equal(counts, [[[1, 0], [1, 0]], [[0, 0], [0, 1]]])
+
+
+def test_count_chunk_with_missing_strata():
+    survey = SURVEY.assign(age_band=['40-49', None, '40-49', '50-59'])
+    counts = count_chunk(survey, 'smoking_status', 'smoker', 'non-smoker', 'diagnosis_codes', CODES,
+                         strata='age_band')
+    assert list(counts) == ['40-49']
+    np.testing.assert_array_equal(counts['40-49'], [[1, 0], [0, 0]])
+
+
+def test_count_chunk_on_cached_categoricals(tmp_path):
+    # epi.data returns text columns as categoricals; blank codes are missing
+    path = tmp_path / 'survey.csv'
+    survey = pd.DataFrame({
+        'smoking_status': ['smoker', 'smoker', 'non-smoker', 'non-smoker', 'smoker'],
+        'diagnosis_codes': ['C34.90;I10', None, 'C34.901', 'C96.29', ''],
+    })
+    survey.to_csv(path, index=False)
+    cached = load(str(path))
+    assert isinstance(cached['diagnosis_codes'].dtype, pd.CategoricalDtype)
+    table = count_chunk(cached, 'smoking_status', 'smoker', 'non-smoker', 'diagnosis_codes', CODES)[TOTAL]
+    np.testing.assert_array_equal(table, [[1, 2], [1, 1]])
+    np.testing.assert_array_equal(count_file(path)[TOTAL], table)
+
+
+def test_tutorial_survey_matches_statsmodels():
+    from statsmodels.stats.contingency_tables import Table2x2
+
+    from epi.contingency import odds_ratio, relative_risk
+    from epi.data import cached
+
+    table = count_chunk(cached('smoking_survey'), 'smoking_status', 'smoker', 'non-smoker', 'diagnosis_codes',
+                        CODES)[TOTAL]
+    np.testing.assert_array_equal(table, [[724, 1070], [179, 1527]])
+
+    reference = Table2x2(table)
+    rr, lower, upper = relative_risk(table)
+    assert rr == pytest.approx(reference.riskratio)
+    assert (lower, upper) == pytest.approx(tuple(reference.riskratio_confint()))
+    assert odds_ratio(table)[0] == pytest.approx(reference.oddsratio)
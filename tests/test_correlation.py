@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.stats import spearmanr
+
+from epi.correlation import correlations, count_matrix, count_matrix_chunked
+from epi.data import cached
+
+
+def test_matches_tutorial_corrcoef():
+    frame = cached('disease_distance')
+    result = correlations(count_matrix(frame))
+    for disease in ('Cholera', 'Influenza', 'No Enteric Diseases'):
+        # group_by_distance and np.corrcoef from the correlation tutorial
+        counts = frame[frame['Disease'] == disease].groupby('Distance from Well A').size()
+        assert result.loc[disease, 'pearson'] == pytest.approx(np.corrcoef(counts.index, counts.values)[0, 1])
+        assert result.loc[disease, 'spearman'] == pytest.approx(spearmanr(counts.index, counts.values)[0])
+        assert result.loc[disease, 'bins'] == len(counts)
+    assert result.loc['Cholera', 'pearson'] == pytest.approx(-0.4704, abs=1e-4)
+
+
+def test_chunked_matches_in_memory(tmp_path):
+    path = tmp_path / 'cases.csv'
+    cached('disease_distance').to_csv(path, index=False)
+    chunked = count_matrix_chunked(path, width=2.0, chunksize=70)
+    pd.testing.assert_frame_equal(chunked, count_matrix(pd.read_csv(path), width=2.0), check_dtype=False)
+
+
+def test_chunked_empty_files(tmp_path):
+    header_only = tmp_path / 'header.csv'
+    header_only.write_text('Disease,Distance from Well A\n')
+    counts = count_matrix_chunked(header_only)
+    assert counts.shape == (0, 0)
+    assert correlations(counts).empty
+
+    empty = tmp_path / 'empty.csv'
+    empty.write_text('')
+    with pytest.raises(ValueError, match='is empty'):
+        count_matrix_chunked(empty)
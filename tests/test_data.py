@@ -0,0 +1,64 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from epi.data import _entry_dir, _read_meta, build, load, read_csv
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / 'cases.csv'
+    pd.DataFrame({
+        'region': ['North', 'South', None, 'North'],
+        'cases': [3, 5, 7, 11],
+        'rate': [0.5, np.nan, 1.5, 2.0],
+    }).to_csv(path, index=False)
+    return str(path)
+
+
+def test_read_csv_matches_pandas(csv_path):
+    expected = pd.read_csv(csv_path)
+    pd.testing.assert_frame_equal(read_csv(csv_path), expected)
+    # Second call is served from the cache
+    pd.testing.assert_frame_equal(read_csv(csv_path), expected)
+
+
+def test_load_selected_columns(csv_path):
+    frame = load(csv_path, columns=['region', 'cases'])
+    assert list(frame.columns) == ['region', 'cases']
+    assert isinstance(frame['region'].dtype, pd.CategoricalDtype)
+    assert frame['region'].isna().tolist() == [False, False, True, False]
+    with pytest.raises(KeyError):
+        load(csv_path, columns=['deaths'])
+
+
+def test_touch_without_change_keeps_entry(csv_path):
+    load(csv_path)
+    version = _read_meta(_entry_dir(csv_path))['version']
+    os.utime(csv_path, ns=(0, 10**18))
+    load(csv_path)
+    meta = _read_meta(_entry_dir(csv_path))
+    assert meta['version'] == version
+    assert meta['files'][0]['mtime_ns'] == 10**18
+
+
+def test_rebuild_keeps_replaced_version_for_readers(csv_path):
+    entry = _entry_dir(csv_path)
+    load(csv_path)
+    first = _read_meta(entry)['version']
+    build(csv_path)
+    second = _read_meta(entry)['version']
+    build(csv_path)
+    third = _read_meta(entry)['version']
+    # A reader that picked up the replaced version can still load its files
+    assert os.path.isdir(os.path.join(entry, second))
+    assert not os.path.exists(os.path.join(entry, first))
+    assert len({first, second, third}) == 3
+
+
+def test_changed_source_rebuilds(csv_path):
+    load(csv_path)
+    pd.DataFrame({'region': ['East'], 'cases': [1], 'rate': [0.1]}).to_csv(csv_path, index=False)
+    assert load(csv_path)['region'].tolist() == ['East']
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from epi.diagnosis import CodeIndex
+
+CODES = pd.Series(['C34.90;I10', 'C34.901', None, 'I10; C96.29', 'C34', '', 'C34.90;C34.901', 'E11'],
+                  index=list('abcdefgh'))
+
+
+def _split(codes):
+    return [set() if not isinstance(value, str) else {code.strip() for code in value.split(';')} - {''}
+            for value in codes]
+
+
+def test_exact_codes_do_not_match_longer_codes():
+    index = CodeIndex.from_series(CODES)
+    flags = index.match({'lung_cancer': ['C34.90', 'C96.29']})
+    assert flags.index.tolist() == list('abcdefgh')
+    assert flags['lung_cancer'].tolist() == [True, False, False, True, False, False, True, False]
+
+
+def test_prefix_patterns_cover_longer_codes():
+    index = CodeIndex.from_series(CODES)
+    flags = index.match({'any_c34': ['C34*'], 'c34_9': ['C34.9*'], 'none': ['Z99', 'X*']})
+    assert flags['any_c34'].tolist() == [True, True, False, False, True, False, True, False]
+    assert flags['c34_9'].tolist() == [True, True, False, False, False, False, True, False]
+    assert not flags['none'].any()
+
+
+def test_match_agrees_with_row_by_row_split():
+    rng = np.random.default_rng(0)
+    vocabulary = np.array(['C34', 'C34.9', 'C34.90', 'C34.901', 'C96.29', 'I10', 'E11.9'])
+    codes = pd.Series([';'.join(rng.choice(vocabulary, rng.integers(0, 4), replace=False)) for _ in range(500)])
+    definitions = {'exact': ['C34.90', 'C96.29'], 'prefix': ['C34.9*'], 'mixed': ['E11*', 'C34']}
+    flags = CodeIndex.from_series(codes.astype('category')).match(definitions)
+    rows = _split(codes)
+    for name, patterns in definitions.items():
+        expected = [any(code == pattern or (pattern.endswith('*') and code.startswith(pattern[:-1]))
+                        for code in row for pattern in patterns) for row in rows]
+        assert flags[name].tolist() == expected
+    np.testing.assert_array_equal(CodeIndex.from_series(codes).has_any(['C34.9*']), flags['prefix'])
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from epi.compartmental import solve_model
+from epi.fitting import fit, solve_sensitivities
+
+
+def _incidence(model, y0, times, **params):
+    trajectory = solve_model(model, [y0], times, method='DOP853', **params)[0]
+    return trajectory[:-1, 0] - trajectory[1:, 0]
+
+
+def test_sensitivities_match_finite_differences():
+    times = np.arange(0, 41, 1.0)
+    params = {'N': 1000, 'beta': 0.5, 'gamma': 0.1, 'sigma': 0.2}
+    _, s = solve_sensitivities('seir', [999, 0, 1, 0], times, params, ['beta', 'sigma'])
+    for column, name in enumerate(['beta', 'sigma']):
+        step = 1e-4
+        up, down = (solve_sensitivities('seir', [999, 0, 1, 0], times, {**params, name: params[name] + sign * step},
+                                        ['beta'])[0] for sign in (1, -1))
+        np.testing.assert_allclose(s[:, :, column], (up - down) / (2 * step), rtol=1e-2, atol=0.5)
+
+
+@pytest.mark.parametrize('loss', ['gaussian', 'poisson'])
+def test_recovers_sir_parameters(loss):
+    times = np.arange(0, 61, 1.0)
+    observed = _incidence('sir', [999, 1, 0], times, N=1000, beta=0.3, gamma=0.1)
+    result = fit('sir', observed, times, [999, 1, 0], N=1000, loss=loss)
+    assert result['success']
+    assert result['params'] == pytest.approx({'beta': 0.3, 'gamma': 0.1}, rel=1e-3)
+    assert result['batch_candidates'] == 64
+
+
+def test_fixed_parameters_are_not_fitted():
+    times = np.arange(0, 61, 1.0)
+    observed = _incidence('seir', [999, 0, 1, 0], times, N=1000, beta=0.5, gamma=0.1, sigma=0.2)
+    result = fit('seir', observed, times, [999, 0, 1, 0], N=1000, fitted=['beta', 'gamma'], fixed={'sigma': 0.2})
+    assert set(result['params']) == {'beta', 'gamma'}
+    assert result['params'] == pytest.approx({'beta': 0.5, 'gamma': 0.1}, rel=1e-3)
+
+
+def test_rejects_bad_inputs():
+    times = np.arange(0, 11, 1.0)
+    with pytest.raises(ValueError, match='one value per interval'):
+        fit('sir', np.ones(len(times)), times, [999, 1, 0], N=1000)
+    with pytest.raises(ValueError, match='needs values'):
+        fit('seir', np.ones(10), times, [999, 0, 1, 0], N=1000, fitted=['beta'])
@@ -0,0 +1,15 @@
+import numpy as np
+
+from epi.benchmarks.incidence import loop_change
+from epi.data import cached
+from epi.incidence import CHANGE, RATE, add_incidence_columns
+
+
+def test_matches_tutorial_loop():
+    data = cached('depression').copy()
+    result = add_incidence_columns(data.sample(frac=1, random_state=0))
+    expected = loop_change(add_incidence_columns(data).drop(columns=CHANGE))
+    merged = result.merge(expected, on=['Region', 'Year'], suffixes=('', ' loop'))
+    assert len(merged) == len(data)
+    np.testing.assert_allclose(merged[RATE], merged[f'{RATE} loop'])
+    np.testing.assert_allclose(merged[CHANGE], merged[f'{CHANGE} loop'])
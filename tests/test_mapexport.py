@@ -0,0 +1,70 @@
+import json
+import os
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from epi.mapexport import export_map, pixel_size, simplify, to_topojson
+
+
+def _grid(n=3):
+    # n x n unit squares sharing their borders, one with a hole and one multipart
+    cells = [shapely.box(x, y, x + 1, y + 1) for y in range(n) for x in range(n)]
+    cells[4] = cells[4].difference(shapely.box(1.4, 1.4, 1.6, 1.6))
+    cells[8] = shapely.MultiPolygon([cells[8], shapely.box(5, 5, 6, 6)])
+    return np.array(cells, dtype=object)
+
+
+def _decode(topology):
+    scale = np.array(topology['transform']['scale'])
+    translate = np.array(topology['transform']['translate'])
+    rings = [np.cumsum(np.array(arc), axis=0) * scale + translate for arc in topology['arcs']]
+
+    def polygon(arcs):
+        return shapely.Polygon(rings[arcs[0][0]], [rings[hole[0]] for hole in arcs[1:]])
+
+    shapes = []
+    for feature in topology['objects']['counties']['geometries']:
+        if feature['type'] == 'Polygon':
+            shapes.append(polygon(feature['arcs']))
+        else:
+            shapes.append(shapely.MultiPolygon([polygon(part) for part in feature['arcs']]))
+    return np.array(shapes, dtype=object)
+
+
+def test_topojson_round_trip():
+    geometries = _grid()
+    properties = [{'id': i} for i in range(len(geometries))]
+    topology = to_topojson(geometries, properties, scale=0.01)
+    decoded = _decode(topology)
+    np.testing.assert_allclose(shapely.area(decoded), shapely.area(geometries), rtol=1e-9)
+    assert (shapely.area(shapely.symmetric_difference(decoded, geometries)) < 1e-9).all()
+    assert [feature['properties'] for feature in topology['objects']['counties']['geometries']] == properties
+
+
+def test_simplify_keeps_shared_borders():
+    wiggly = shapely.Polygon([(0, 0), (1, 0), (1, 0.3), (1.01, 0.5), (1, 0.7), (1, 1), (0, 1)])
+    right = shapely.box(1, 0, 2, 1).difference(wiggly)
+    simplified = simplify([wiggly, right], 0.05)
+    assert shapely.area(shapely.intersection(*simplified)) < 1e-9
+    assert shapely.area(shapely.union_all(simplified)) == shapely.area(shapely.union_all([wiggly, right]))
+
+
+def test_export_map_writes_one_level_per_zoom(tmp_path):
+    polygons = gpd.GeoDataFrame(geometry=_grid(), crs='EPSG:4326')
+    colors = ['#ff0000'] * len(polygons)
+    written = export_map(polygons, str(tmp_path), colors, np.full(len(polygons), 0.6), zooms=(3, 7),
+                         tooltips=[f'<b>{i}</b>' for i in range(len(polygons))])
+    assert sorted(os.path.relpath(path, tmp_path) for path in written) == [
+        'index.html', os.path.join('levels', 'z3.js'), os.path.join('levels', 'z7.js')]
+    assert all(size == os.path.getsize(path) for path, size in written.items())
+
+    with open(tmp_path / 'levels' / 'z7.js') as handle:
+        prefix, payload = handle.read().split(' = ', 1)
+    assert prefix == 'window.EPI_LEVELS[7]'
+    topology = json.loads(payload.rstrip(';\n'))
+    assert topology['transform']['scale'] == [pixel_size(7) / 2] * 2
+    first = topology['objects']['counties']['geometries'][0]['properties']
+    assert first == {'fill_color': '#ff0000', 'fill_opacity': 0.6, 'tooltip': '<b>0</b>'}
+    assert '[3, 7]' in (tmp_path / 'index.html').read_text()
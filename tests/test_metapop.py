@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from epi.compartmental import solve_model
+from epi.metapop import mobility_matrix, region_frame, save_timeseries, solve_metapop
+
+Y0 = np.array([[990, 0, 10, 0], [2000, 0, 0, 0], [500, 0, 0, 0]], dtype=float)
+TIMES = np.arange(0, 121, 1.0)
+
+
+def test_mobility_matrix_is_row_stochastic():
+    mobility = mobility_matrix([0, 0, 1, 2], [1, 0, 2, 0], [100, 50, 300, 20], Y0.sum(axis=1))
+    assert mobility.format == 'csr'
+    np.testing.assert_allclose(np.asarray(mobility.sum(axis=1)).ravel(), 1.0)
+    assert mobility[0, 1] == pytest.approx(0.1)
+    with pytest.raises(ValueError, match='exceed'):
+        mobility_matrix([0], [1], [5000], Y0.sum(axis=1))
+
+
+def test_isolated_regions_follow_single_population_model():
+    trajectory = solve_metapop(Y0, TIMES, sparse.identity(3, format='csr'), beta=0.5, gamma=0.1, sigma=0.2)
+    expected = solve_model('seir', Y0, TIMES, N=Y0.sum(axis=1), beta=0.5, gamma=0.1, sigma=0.2)
+    np.testing.assert_allclose(trajectory, expected, atol=1e-8)
+    # No commuting: uninfected regions stay uninfected
+    assert trajectory[1:, -1, 0] == pytest.approx(Y0[1:, 0])
+
+
+def test_commuting_spreads_infection_and_conserves_population():
+    mobility = mobility_matrix([0, 1, 1, 2], [1, 0, 2, 1], [100, 200, 100, 50], Y0.sum(axis=1))
+    trajectory = solve_metapop(Y0, TIMES, mobility, beta=0.5, gamma=0.1, sigma=0.2)
+    np.testing.assert_allclose(trajectory.sum(axis=2), np.repeat(Y0.sum(axis=1)[:, None], len(TIMES), axis=1))
+    frame = region_frame(trajectory, TIMES, ['A', 'B', 'C'], id_column='id')
+    assert list(frame.columns) == ['id', 'S', 'E', 'I', 'R', 'attack_rate', 'prevalence']
+    assert (frame['attack_rate'] > 0.5).all()
+
+
+def test_save_timeseries(tmp_path):
+    trajectory = solve_metapop(Y0, TIMES[:5], sparse.identity(3, format='csr'), beta=0.5, gamma=0.1, sigma=0.2)
+    path = tmp_path / 'series.npz'
+    save_timeseries(path, trajectory, TIMES[:5], ['A', 'B', 'C'])
+    with np.load(path) as saved:
+        np.testing.assert_array_equal(saved['trajectory'], trajectory)
+        assert saved['region_ids'].tolist() == ['A', 'B', 'C']
+        assert saved['compartments'].tolist() == ['S', 'E', 'I', 'R']
@@ -0,0 +1,52 @@
+import numpy as np
+
+from epi.network import (
+    _neighbours,
+    csr_from_edges,
+    load_graph,
+    random_graph,
+    run_replicates,
+    save_graph,
+    simulate,
+    steps_run,
+)
+
+
+def test_csr_from_edges_is_symmetric_without_self_loops():
+    indptr, indices = csr_from_edges([0, 1, 2, 3], [1, 2, 2, 0], 4)
+    neighbours = [sorted(indices[indptr[i]:indptr[i + 1]].tolist()) for i in range(4)]
+    assert neighbours == [[1, 3], [0, 2], [1], [0]]
+    assert _neighbours(indptr, indices, np.array([0, 2])).tolist() == [1, 3, 1]
+
+
+def test_counts_are_consistent():
+    indptr, indices = random_graph(2000, mean_degree=8, seed=0)
+    for sigma in (None, 0.3):
+        counts = simulate(indptr, indices, 150, beta=0.1, gamma=0.2, sigma=sigma, seed=1)
+        assert (counts.sum(axis=1) == 2000).all()
+        assert (np.diff(counts[:, 0]) <= 0).all() and (np.diff(counts[:, 3]) >= 0).all()
+        if sigma is None:
+            assert not counts[:, 1].any()
+
+
+def test_steps_run_stops_at_extinction():
+    # A graph with no edges: the seeded infections only recover
+    indptr, indices = csr_from_edges([], [], 100)
+    counts = simulate(indptr, indices, 200, beta=0.5, gamma=0.5, initial_infected=5, seed=2)
+    steps = steps_run(counts)
+    assert steps < 200
+    assert counts[steps, 2] == 0 and counts[steps - 1, 2] > 0
+    assert (counts[steps:] == counts[steps]).all()
+
+    indptr, indices = random_graph(1000, seed=0)
+    assert steps_run(simulate(indptr, indices, 5, beta=0.5, gamma=0.01, seed=0)) == 5
+
+
+def test_replicates_reproducible_across_workers(tmp_path):
+    save_graph(str(tmp_path), *random_graph(500, seed=3))
+    indptr, indices = load_graph(str(tmp_path))
+    assert isinstance(indptr, np.memmap)
+    serial = run_replicates(str(tmp_path), 3, 30, beta=0.1, gamma=0.1, sigma=0.3, seed=4)
+    parallel = run_replicates(str(tmp_path), 3, 30, beta=0.1, gamma=0.1, sigma=0.3, seed=4, workers=2)
+    assert serial.shape == (3, 31, 4)
+    np.testing.assert_array_equal(serial, parallel)
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from epi.data import cached
+from epi.incidence import CASES, POPULATION
+from epi.rates import PREVALENCE, prepare, summarize
+
+
+def _with_missing_cases():
+    data = cached('depression').copy()
+    data[CASES] = data[CASES].astype(float)
+    data.loc[[0, 3, 17, 40], CASES] = np.nan
+    return data
+
+
+def test_crude_means_match_tutorial_groupby():
+    data = _with_missing_cases()
+    tables = summarize(data)
+    rows = prepare(data, change_by=None)
+    for key in ('Year', 'Region'):
+        expected = rows.groupby(key, observed=True)[PREVALENCE].mean()
+        np.testing.assert_allclose(tables[(key,)][PREVALENCE], expected.to_numpy())
+
+
+def test_weighted_rates_skip_rows_with_missing_cases():
+    data = _with_missing_cases()
+    table = summarize(data, grouping_sets=(('Year',),))[('Year',)].set_index('Year')
+    complete = data.dropna(subset=[CASES])
+    pooled = complete.groupby('Year')[[CASES, POPULATION]].sum()
+    np.testing.assert_allclose(table[f'Weighted {PREVALENCE}'], 100 * pooled[CASES] / pooled[POPULATION])
+    assert table.loc[2010, 'n'] == 8
+
+
+def test_rollups_match_direct_grouping():
+    data = cached('depression')
+    tables = summarize(data)
+    for keys in (('Year',), ('Region',)):
+        direct = summarize(data, grouping_sets=(keys,))[keys]
+        np.testing.assert_allclose(tables[keys][PREVALENCE], direct[PREVALENCE])
+    by_year = tables[('Year',)]
+    assert by_year[CASES].sum() == pytest.approx(data[CASES].sum())
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from epi.scenarios import load_shards, run_grid
+
+
+def _write_grid(path, n):
+    rng = np.random.default_rng(0)
+    pd.DataFrame({
+        'N': 1000.0,
+        'beta': rng.uniform(0.2, 0.6, n),
+        'gamma': rng.uniform(0.05, 0.2, n),
+        'sigma': 0.2,
+    }).to_csv(path, index=False)
+
+
+def _rows(out_dir):
+    return np.sort(np.concatenate([rows for rows, _ in load_shards(out_dir)]))
+
+
+def test_resume_skips_finished_chunks(tmp_path):
+    grid = tmp_path / 'grid.csv'
+    _write_grid(grid, 25)
+    out_dir = tmp_path / 'out'
+    assert run_grid(grid, out_dir, chunk_size=10, workers=1)['chunks_run'] == 3
+    assert run_grid(grid, out_dir, chunk_size=10, workers=1)['chunks_skipped'] == 3
+    np.testing.assert_array_equal(_rows(out_dir), np.arange(25))
+
+
+def test_resume_with_other_chunk_size_is_refused(tmp_path):
+    grid = tmp_path / 'grid.csv'
+    _write_grid(grid, 25)
+    out_dir = tmp_path / 'out'
+    run_grid(grid, out_dir, chunk_size=10, workers=1)
+    with pytest.raises(ValueError):
+        run_grid(grid, out_dir, chunk_size=5, workers=1)
+
+    run_grid(grid, out_dir, chunk_size=5, workers=1, overwrite=True)
+    np.testing.assert_array_equal(_rows(out_dir), np.arange(25))
+
+
+def test_resume_with_edited_grid_is_refused(tmp_path):
+    grid = tmp_path / 'grid.csv'
+    _write_grid(grid, 25)
+    out_dir = tmp_path / 'out'
+    run_grid(grid, out_dir, chunk_size=10, workers=1)
+    _write_grid(grid, 30)
+    with pytest.raises(ValueError):
+        run_grid(grid, out_dir, chunk_size=10, workers=1)
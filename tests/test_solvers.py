@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from epi.solvers import odeint_baseline, solve
+
+SEIR = {'N': 1000, 'beta': 0.5, 'gamma': 0.1, 'sigma': 0.2}
+
+
+@pytest.mark.parametrize('method', ['LSODA', 'BDF', 'RK45'])
+def test_matches_odeint(method):
+    times = np.arange(0, 101, 1)
+    result = solve('seir', [999, 0, 1, 0], times, method=method, stop_at_end=False, rtol=1e-8, atol=1e-8, **SEIR)
+    baseline = odeint_baseline('seir', [999, 0, 1, 0], times, **SEIR)
+    np.testing.assert_allclose(result['y'], baseline['y'], atol=1e-3)
+
+
+def test_events_agree_with_trajectory():
+    times = np.arange(0, 401, 1)
+    result = solve('sir', [999, 1, 0], times, N=1000, beta=0.3, gamma=0.1)
+    events = result['events']
+    S, I = result['solution'](events['peak'])[:2]
+    assert 0.3 / 0.1 * S / 1000 == pytest.approx(1, abs=1e-4)
+    assert events['reff_below_1'] == pytest.approx(events['peak'], abs=1e-3)
+    # Integration stops once E + I falls below the threshold
+    assert result['times'][-1] <= events['end'] < times[-1]
+
+
+def test_reff_already_below_1_reports_start():
+    result = solve('sir', [200, 10, 790], np.arange(5, 50, 1), N=1000, beta=0.3, gamma=0.1)
+    assert result['events']['reff_below_1'] == 5.0
+    assert result['events']['peak'] is None
+
+
+def test_rejects_unknown_method():
+    with pytest.raises(ValueError, match='unknown method'):
+        solve('sir', [999, 1, 0], [0, 1], method='euler', N=1000, beta=0.3, gamma=0.1)
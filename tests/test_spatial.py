@@ -0,0 +1,39 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import shapely
+
+from epi.spatial import PolygonIndex
+
+
+def _write_counties(path, ids):
+    boxes = shapely.box(np.arange(3.0), 0.0, np.arange(3.0) + 1, 1.0)
+    gpd.GeoDataFrame({'GEOID': ids}, geometry=boxes, crs='EPSG:4326').to_file(path)
+
+
+def test_from_file_cache_tracks_attribute_changes(tmp_path):
+    path = str(tmp_path / 'counties.shp')
+    _write_counties(path, ['01001', '01003', '01005'])
+    first = PolygonIndex.from_file(path)
+    assert first.ids.tolist() == ['01001', '01003', '01005']
+
+    # Geometry unchanged, attribute table rewritten
+    _write_counties(path, ['02001', '02003', '02005'])
+    second = PolygonIndex.from_file(path)
+    assert second.ids.tolist() == ['02001', '02003', '02005']
+    assert second.assign(np.array([[1.5, 0.5]])).tolist() == [1]
+
+
+def test_from_file_reuses_cache_without_pickle(tmp_path, cache_dir):
+    path = str(tmp_path / 'counties.shp')
+    _write_counties(path, ['01001', '01003', '01005'])
+    built = PolygonIndex.from_file(path)
+
+    (entry,) = os.listdir(cache_dir)
+    (version,) = [name for name in os.listdir(cache_dir / entry) if name != 'meta.json']
+    assert sorted(os.listdir(cache_dir / entry / version)) == ['ids.npy', 'offsets.npy', 'wkb.npy']
+    cached = PolygonIndex.from_file(path)
+    assert cached.ids.tolist() == built.ids.tolist()
+    assert shapely.equals(cached.geometries, built.geometries).all()
+    assert cached.crs is not None
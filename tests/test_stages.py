@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from epi.data import cached
+from epi.incidence import CHANGE
+from epi.stages import BASELINE_STAGES, STAGES, load_input, run, synthetic_input
+
+
+def test_incidence_leaves_shared_input_alone():
+    data = load_input('depression')
+    columns = list(data.columns)
+    run('incidence')
+    assert load_input('depression') is data
+    assert list(data.columns) == columns
+
+
+def test_incidence_matches_loop_baseline():
+    vectorized = run('incidence')
+    loop = BASELINE_STAGES['incidence-loop'][1](cached('depression'))
+    merged = vectorized.merge(loop, on=['Region', 'Year'], suffixes=('', ' loop'))
+    np.testing.assert_allclose(merged[CHANGE], merged[f'{CHANGE} loop'])
+
+
+def test_odds_ratio_matches_apply_baseline():
+    baseline = BASELINE_STAGES['odds-ratio-apply'][1](cached('smoking_survey'))
+    result = run('odds-ratio')
+    np.testing.assert_array_equal(result['table'], baseline['table'])
+    assert result['odds_ratio'] == pytest.approx(baseline['odds_ratio'])
+
+
+def test_correlation_matches_filter_baseline():
+    baseline = BASELINE_STAGES['correlation-filter'][1](cached('disease_distance'))
+    result = run('correlation')
+    for disease, value in baseline.items():
+        assert result.loc[disease, 'pearson'] == pytest.approx(value)
+
+
+@pytest.mark.parametrize('stage', [name for name in STAGES if name != 'map'])
+def test_stages_run_on_synthetic_input(stage):
+    input_name, function = STAGES[stage]
+    assert function(synthetic_input(input_name, scale=0.5)) is not None
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from epi.compartmental import solve_model
+from epi.stochastic import simulate, stoichiometry, summarize
+
+SEIR = {'N': 2_000, 'beta': 0.5, 'gamma': 0.1, 'sigma': 0.2}
+Y0 = [1_960, 0, 40, 0]
+
+
+@pytest.mark.parametrize('method', ['gillespie', 'tau'])
+def test_population_is_conserved(method):
+    result = summarize('seir', Y0, np.arange(0, 31, 5), replicates=50, method=method, seed=1, **SEIR)
+    np.testing.assert_allclose(result['mean'].sum(axis=1), sum(Y0))
+    assert (result['quantiles'] >= 0).all()
+    np.testing.assert_array_equal(result['quantiles'][0], np.tile(Y0, (3, 1)))
+
+
+@pytest.mark.parametrize('method', ['gillespie', 'tau'])
+def test_mean_follows_deterministic_model(method):
+    times = np.arange(0, 61, 10)
+    result = summarize('seir', Y0, times, replicates=100, method=method, seed=2, **SEIR)
+    expected = solve_model('seir', [Y0], times, **SEIR)[0]
+    np.testing.assert_allclose(result['mean'], expected, atol=0.03 * SEIR['N'])
+
+
+def test_seed_reproduces_summary():
+    runs = [summarize('sir', [990, 10, 0], [0, 10, 20], replicates=20, seed=3, N=1000, beta=0.3, gamma=0.1)
+            for _ in range(2)]
+    np.testing.assert_array_equal(runs[0]['quantiles'], runs[1]['quantiles'])
+
+
+def test_stoichiometry_moves_one_individual():
+    np.testing.assert_array_equal(stoichiometry('sir'), [[-1, 1, 0], [0, -1, 1]])
+
+
+def test_rejects_bad_arguments():
+    with pytest.raises(ValueError, match='needs parameters'):
+        next(simulate('sir', [990, 10, 0], [0, 1], N=1000, beta=0.3))
+    with pytest.raises(ValueError, match='unknown stochastic method'):
+        next(simulate('sir', [990, 10, 0], [0, 1], method='euler', N=1000, beta=0.3, gamma=0.1))
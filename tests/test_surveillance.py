@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from epi.data import cached
+from epi.incidence import CASES
+from epi.rates import summarize
+from epi.surveillance import SurveillanceState
+
+
+def _depression():
+    frame = cached('depression').copy()
+    frame['Region'] = frame['Region'].astype(str)
+    return frame
+
+
+def _assert_same(state, data):
+    expected = summarize(data)
+    actual = state.summary()
+    assert set(actual) == set(expected)
+    for keys, frame in expected.items():
+        pd.testing.assert_frame_equal(actual[keys], frame, check_dtype=False)
+
+
+def test_incremental_updates_reproduce_summarize(tmp_path):
+    data = _depression()
+    state = SurveillanceState.open(str(tmp_path / 'state'))
+    for year in sorted(data['Year'].unique()):
+        assert state.update(data[data['Year'] == year]) is False
+    _assert_same(SurveillanceState.open(str(tmp_path / 'state')), data)
+
+
+def test_revision_rebuilds(tmp_path):
+    data = _depression()
+    state = SurveillanceState.open(str(tmp_path / 'state'))
+    state.update(data[data['Year'] < 2015])
+    state.update(data[data['Year'] >= 2015])
+
+    revised = data.copy()
+    first = (revised['Year'] == 2012) & (revised['Region'] == 'North')
+    revised.loc[first, CASES] += 500
+    assert state.update(revised[first]) is True
+    _assert_same(state, revised)
+
+
+def test_state_is_saved_as_json(tmp_path):
+    data = _depression()
+    directory = tmp_path / 'state'
+    SurveillanceState.open(str(directory)).update(data)
+    assert sorted(os.listdir(directory)) == ['rows.csv', 'state.json']
+    reopened = SurveillanceState.open(str(directory))
+    _assert_same(reopened, data)
+    pd.testing.assert_frame_equal(reopened.changes(), SurveillanceState.open(str(directory)).changes())
+
+    # Without state.json the state is rebuilt from the row log
+    os.remove(directory / 'state.json')
+    _assert_same(SurveillanceState.open(str(directory)), data)
+
+
+def test_duplicates_in_first_batch_keep_last_copy(tmp_path):
+    data = _depression()
+    revised = data[data['Year'] == 2012].assign(**{CASES: lambda frame: frame[CASES] + 100})
+    state = SurveillanceState.open(str(tmp_path / 'state'))
+    assert state.update(pd.concat([data, revised])) is True
+    expected = pd.concat([data[data['Year'] != 2012], revised])
+    _assert_same(state, expected)
+    assert state.rows == len(data)
+
+
+def test_missing_cases_are_left_out(tmp_path):
+    data = _depression()
+    data[CASES] = data[CASES].astype(float)
+    data.loc[[5, 30], CASES] = np.nan
+    state = SurveillanceState.open(str(tmp_path / 'state'))
+    for year in sorted(data['Year'].unique()):
+        state.update(data[data['Year'] == year])
+    _assert_same(state, data)
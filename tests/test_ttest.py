@@ -0,0 +1,65 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from epi.data import cached
+from epi.ttest import adjust_pvalues, column_summaries, to_wide, welch_ttests
+
+
+@pytest.mark.parametrize('method', ['bonferroni', 'holm', 'fdr_bh'])
+def test_adjust_pvalues_ignores_nan(method):
+    p = np.array([0.001, 0.02, np.nan, 0.3])
+    adjusted = adjust_pvalues(p, method)
+    assert np.isnan(adjusted[2])
+    np.testing.assert_allclose(np.delete(adjusted, 2), adjust_pvalues(np.delete(p, 2), method))
+
+
+def test_adjust_pvalues_all_nan():
+    assert np.isnan(adjust_pvalues([np.nan, np.nan])).all()
+
+
+def test_one_observation_column_does_not_mask_other_pairs():
+    wide = to_wide(cached('belfast_suicide'))
+    wide['Empty'] = np.nan
+    wide['Single'] = np.nan
+    wide.iloc[0, wide.columns.get_loc('Single')] = 5.0
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', RuntimeWarning)
+        summary = column_summaries(wide)
+        result = welch_ttests(wide)
+
+    assert np.isnan(summary.loc['Single', 'variance'])
+    assert summary.loc['Empty', 'n'] == 0
+    main = result[(result['group 1'] == 'Belfast North') & (result['group 2'] == 'Belfast South')].iloc[0]
+    # The only defined test, so its adjusted p equals its p
+    assert main['p adjusted'] == pytest.approx(main['p'])
+    assert main['reject']
+    undefined = result.drop(main.name)
+    assert undefined['p adjusted'].isna().all()
+    assert not undefined['reject'].any()
+
+
+def test_welch_ttests_match_scipy_and_statsmodels():
+    from scipy.stats import ttest_ind
+    from statsmodels.stats.multitest import multipletests
+
+    rng = np.random.default_rng(0)
+    wide = pd.DataFrame(rng.normal(rng.uniform(5, 20, 6), rng.uniform(1, 5, 6), (22, 6)),
+                        columns=[f'Area {i}' for i in range(6)])
+    wide.iloc[:4, 2] = np.nan
+    for method in ('bonferroni', 'holm', 'fdr_bh'):
+        result = welch_ttests(wide, correction=method)
+        for row in result.itertuples():
+            reference = ttest_ind(wide[row[1]], wide[row[2]], equal_var=False, nan_policy='omit')
+            assert row.t == pytest.approx(reference.statistic)
+            assert row.p == pytest.approx(reference.pvalue)
+        np.testing.assert_allclose(result['p adjusted'], multipletests(result['p'], method=method)[1])
+
+
+def test_belfast_matches_tutorial():
+    result = welch_ttests(to_wide(cached('belfast_suicide'))).iloc[0]
+    assert result['t'] == pytest.approx(3.37682, abs=1e-5)
+    assert result['p'] == pytest.approx(0.001878, abs=1e-6)